@@ -0,0 +1,335 @@
+"""
+Latency, throughput and agreement of every natural-language datetime parser.
+
+    python benchmarks/bench_parsers.py [--tree PATH|REV] [--baseline REV|auto|none]
+                                       [--size N] [--rounds N]
+                                       [--output bench_output.txt]
+
+Every parser sees the same corpus against a fixed reference clock, so
+results are comparable between runs and between trees. --tree and
+--baseline take a directory or any git revision of this repository
+(exported to a temporary directory).
+
+Every SmartTimeParser in the current tree delegates to one time_parser
+engine, so those rows agree by construction. The differential part of
+the report therefore compares them against a baseline tree, by default
+the revision just before time_parser.py was added (--baseline auto),
+found from git history so it survives rebases.
+
+For each parser the report gives per-call p50/p99 latency on a cold pass
+(parse cache cleared, where the tree has one) and on warm repeat passes,
+plus throughput and the parse cache hit rate over all passes. When the
+corpus holds more distinct phrases than the parse cache, the warm passes
+show LRU thrashing and the report says so. It then lists the phrases on
+which the parsers' outputs disagree.
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from corpus import build_corpus  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZE = 3000
+
+# Sunday afternoon: weekday, past-time roll-over and year boundaries all matter
+REFERENCE_NOW = datetime(2026, 10, 18, 15, 30)
+
+# (label, module, how to call it on one phrase)
+PARSERS = [
+    ("integrations.SmartTimeParser", "integrations",
+     lambda module: module.SmartTimeParser().extract_datetime),
+    ("chatbot.SmartTimeParser", "chatbot",
+     lambda module: module.SmartTimeParser().extract_datetime),
+    ("google_calendar.SmartTimeParser", "google_calendar",
+     lambda module: module.SmartTimeParser().extract_datetime),
+    ("google_calendar.parse_datetime_for_event", "google_calendar",
+     lambda module: module.parse_datetime_for_event),
+    ("google_tasks.parse_datetime_from_text", "google_tasks",
+     lambda module: module.parse_datetime_from_text),
+]
+
+
+class FrozenDatetime(datetime):
+    """datetime whose now() is REFERENCE_NOW."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(*REFERENCE_NOW.timetuple()[:6])
+
+
+def freeze_clock(module):
+    """Point every global of module that names datetime.datetime at FrozenDatetime."""
+    for name, value in list(vars(module).items()):
+        if value is datetime:
+            setattr(module, name, FrozenDatetime)
+
+
+def load_parsers(tree):
+    sys.path.insert(0, tree)
+    loaded, skipped = [], []
+    for label, module_name, factory in PARSERS:
+        try:
+            # Some modules print banners and DEBUG lines on import and per call
+            with contextlib.redirect_stdout(io.StringIO()):
+                module = importlib.import_module(module_name)
+            freeze_clock(module)
+            loaded.append((label, factory(module)))
+        except Exception as e:
+            skipped.append((label, f"{type(e).__name__}: {e}"))
+    # The shared engine (when the tree has one) reads the clock itself
+    if "time_parser" in sys.modules:
+        freeze_clock(sys.modules["time_parser"])
+    return loaded, skipped
+
+
+def unload_tree(tree):
+    """Forget every module imported from tree, so another tree can be loaded"""
+    prefix = os.path.join(tree, "")
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path and os.path.abspath(path).startswith(prefix):
+            del sys.modules[name]
+    if tree in sys.path:
+        sys.path.remove(tree)
+
+
+def git(*args):
+    return subprocess.run(["git", "-C", REPO_ROOT, *args], capture_output=True, check=True).stdout
+
+
+def shared_parser_baseline():
+    """The revision just before time_parser.py was added, or None"""
+    added = git("log", "--diff-filter=A", "--format=%H", "--", "time_parser.py").split()
+    return f"{added[-1].decode()}^" if added else None
+
+
+def checkout(spec, name=None):
+    """
+    (directory, description, exported) for a directory or a git revision;
+    a revision is exported to a temporary directory the caller removes.
+    """
+    if os.path.isdir(spec):
+        return os.path.abspath(spec), os.path.abspath(spec), False
+    rev = git("rev-parse", "--verify", f"{spec}^{{commit}}").decode().strip()
+    directory = tempfile.mkdtemp(prefix="bench-tree-")
+    with tarfile.open(fileobj=io.BytesIO(git("archive", rev))) as archive:
+        archive.extractall(directory)
+    return directory, f"{name or spec} ({rev[:10]})", True
+
+
+def normalize(result):
+    if result is None:
+        return "None"
+    if isinstance(result, tuple):
+        return " ".join(str(part) for part in result)
+    if isinstance(result, datetime):
+        return result.strftime("%Y-%m-%d %H:%M")
+    return repr(result)
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def clear_caches():
+    engine = sys.modules.get("time_parser")
+    if engine is not None and hasattr(engine, "clear_parse_cache"):
+        engine.clear_parse_cache()
+
+
+def cache_hit_rate():
+    engine = sys.modules.get("time_parser")
+    if engine is None or not hasattr(engine, "parse_cache_stats"):
+        return None
+    return engine.parse_cache_stats()["hit_rate"]
+
+
+def time_pass(parse, corpus):
+    """Run parse over corpus once; return (per-call ns, outputs, errors)."""
+    timings, outputs, errors = [], [], 0
+    clock = time.perf_counter_ns
+    with contextlib.redirect_stdout(io.StringIO()):
+        for phrase in corpus:
+            start = clock()
+            try:
+                result = parse(phrase)
+            except Exception as e:
+                result = f"error: {type(e).__name__}"
+                errors += 1
+            timings.append(clock() - start)
+            outputs.append(normalize(result))
+    return timings, outputs, errors
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    total_s = sum(ordered) / 1e9
+    return {
+        "p50_us": percentile(ordered, 0.50) / 1e3,
+        "p99_us": percentile(ordered, 0.99) / 1e3,
+        "calls_per_s": len(ordered) / total_s if total_s else float("inf"),
+    }
+
+
+def bench(parsers, corpus, rounds):
+    results = {}
+    for label, parse in parsers:
+        clear_caches()
+        cold, outputs, errors = time_pass(parse, corpus)
+        warm = []
+        for _ in range(rounds):
+            timings, _, _ = time_pass(parse, corpus)
+            warm.extend(timings)
+        results[label] = {
+            "cold": summarize(cold),
+            "warm": summarize(warm) if warm else None,
+            "outputs": outputs,
+            "errors": errors,
+            "cache_hit_rate": cache_hit_rate(),
+        }
+    return results
+
+
+def bench_bulk(corpus):
+    """Throughput of time_parser.parse_many, when the tree has it."""
+    engine = sys.modules.get("time_parser")
+    if engine is None or not hasattr(engine, "parse_many"):
+        return None
+    clear_caches()
+    start = time.perf_counter()
+    engine.parse_many(corpus, REFERENCE_NOW)
+    elapsed = time.perf_counter() - start
+    return len(corpus) / elapsed if elapsed else float("inf")
+
+
+def disagreements(results):
+    labels = list(results)
+    rows = []
+    for i, outputs in enumerate(zip(*(results[label]["outputs"] for label in labels))):
+        if len(set(outputs)) > 1:
+            rows.append((i, dict(zip(labels, outputs))))
+    return rows
+
+
+def bench_tree(tree, prefix, corpus, rounds):
+    """Benchmark every parser importable from tree, labelled with prefix"""
+    parsers, skipped = load_parsers(tree)
+    try:
+        results = bench(parsers, corpus, rounds)
+        bulk = bench_bulk(corpus)
+        capacity = getattr(sys.modules.get("time_parser"), "PARSE_CACHE_SIZE", None)
+    finally:
+        unload_tree(tree)
+    results = {prefix + label: result for label, result in results.items()}
+    skipped = [(prefix + label, reason) for label, reason in skipped]
+    return results, skipped, bulk, capacity
+
+
+def report(corpus, results, skipped, bulk, capacity, rows, trees, show):
+    lines = [f"{role}: {description}" for role, description in trees]
+    lines += [
+        f"reference clock: {REFERENCE_NOW:%Y-%m-%d %H:%M (%A)}",
+        f"corpus: {len(corpus)} phrases, {len(set(corpus))} distinct",
+    ]
+    if capacity is not None and len(set(corpus)) > capacity:
+        lines.append(f"note: more distinct phrases than the parse cache holds ({capacity}); "
+                     "warm passes thrash the LRU")
+    lines += [
+        "",
+        f"{'parser':50} {'cold p50':>9} {'cold p99':>9} {'cold/s':>9} {'warm p50':>9} {'warm p99':>9} {'warm/s':>9} {'err':>4} {'cache':>6}",
+    ]
+    for label, result in results.items():
+        cold, warm = result["cold"], result["warm"]
+        row = f"{label:50} {cold['p50_us']:8.1f}u {cold['p99_us']:8.1f}u {cold['calls_per_s']:9.0f}"
+        if warm:
+            row += f" {warm['p50_us']:8.1f}u {warm['p99_us']:8.1f}u {warm['calls_per_s']:9.0f}"
+        else:
+            row += f" {'-':>9} {'-':>9} {'-':>9}"
+        hit_rate = result["cache_hit_rate"]
+        cache = f"{hit_rate:6.0%}" if hit_rate is not None else f"{'-':>6}"
+        lines.append(row + f" {result['errors']:4d} {cache}")
+    for label, reason in skipped:
+        lines.append(f"{label:50} skipped ({reason})")
+    if bulk is not None:
+        lines.append(f"{'time_parser.parse_many (bulk, cold)':50} {'':>9} {'':>9} {bulk:9.0f}")
+
+    lines += ["", f"disagreements: {len(rows)} of {len(corpus)} phrases"]
+    if rows:
+        labels = list(results)
+        # Which parsers part ways most often with the majority answer
+        outliers = Counter()
+        for _, outputs in rows:
+            majority, _ = Counter(outputs.values()).most_common(1)[0]
+            outliers.update(label for label, value in outputs.items() if value != majority)
+        for label in labels:
+            lines.append(f"  {label:50} differs from the majority on {outliers[label]}")
+        lines.append("")
+        distinct = {}
+        for i, outputs in rows:
+            distinct.setdefault(corpus[i], outputs)
+        for phrase, outputs in list(distinct.items())[:show]:
+            lines.append(repr(phrase))
+            for label in labels:
+                lines.append(f"    {label:50} {outputs[label]}")
+        if len(distinct) > show:
+            lines.append(f"... {len(distinct) - show} more distinct phrases")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tree", default=REPO_ROOT,
+                        help="directory or git revision to import the parsers from")
+    parser.add_argument("--baseline", default="auto",
+                        help="directory or git revision to compare against; 'auto' is the "
+                             "revision before the shared time_parser, 'none' skips it")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="number of corpus phrases")
+    parser.add_argument("--rounds", type=int, default=2, help="warm passes after the cold one")
+    parser.add_argument("--show", type=int, default=40, help="disagreeing phrases to list")
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args()
+
+    baseline = shared_parser_baseline() if args.baseline == "auto" else args.baseline
+    corpus = build_corpus(args.size)
+    trees, exported = [], []
+    results, skipped = {}, []
+    try:
+        tree, description, temporary = checkout(args.tree)
+        if temporary:
+            exported.append(tree)
+        trees.append(("tree", description))
+        results, skipped, bulk, capacity = bench_tree(tree, "", corpus, args.rounds)
+        if baseline and baseline != "none":
+            base, description, temporary = checkout(baseline, args.baseline)
+            if temporary:
+                exported.append(base)
+            trees.append(("baseline", description))
+            base_results, base_skipped, _, _ = bench_tree(base, "base: ", corpus, args.rounds)
+            results.update(base_results)
+            skipped += base_skipped
+    finally:
+        for directory in exported:
+            shutil.rmtree(directory, ignore_errors=True)
+    text = report(corpus, results, skipped, bulk, capacity, disagreements(results), trees, args.show)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Phrase corpus for the datetime parser benchmark.
+
+Phrasings are the commands the assistant actually receives: a command
+prefix and subject, then a day and a time in the orders people type them.
+Generation is seeded, so every run (and every tree being compared) sees
+the same phrases in the same order.
+"""
+import random
+
+COMMANDS = [
+    "create task {}", "add task {}", "remind me to {}", "todo {}",
+    "schedule {}", "create event {}", "add {} to my calendar", "book {}",
+    "set up {}", "new meeting {}", "reschedule {} to", "move {} to",
+    "send email to sam@example.com about {}", "schedule email to team@example.com about {}",
+]
+
+SUBJECTS = [
+    "team sync", "call mom", "dentist appointment", "pay rent", "buy milk",
+    "project review", "1:1 with alex", "standup", "gym", "submit report",
+    "lunch with sam", "dinner with parents", "doctor visit", "water the plants",
+    "quarterly planning", "code review", "flight check-in", "renew passport",
+    "birthday party", "interview with candidate",
+]
+
+DAYS = [
+    "", "today", "tomorrow", "day after tomorrow", "yesterday", "next week",
+    "next month", "monday", "on tuesday", "wednesday", "thu", "friday",
+    "saturday", "sunday", "this friday", "next monday", "next friday",
+    "coming sunday", "dec 12", "12 dec", "on 5 jan", "january 15", "25th december",
+    "march 3", "on 20 dec", "2026-11-02", "11/20", "20/11/2026", "in 3 days",
+    "in a week", "the day after tomorrow",
+]
+
+TIMES = [
+    "", "at 5pm", "at 5 pm", "at 5:30 pm", "5pm", "at 9am", "9:15am", "17:30",
+    "at 9:15", "at 3", "at 10", "12pm", "12am", "noon", "at noon", "midnight",
+    "in the morning", "morning", "afternoon", "in the evening", "tonight",
+    "at night", "at lunch", "for dinner", "for breakfast", "in 2 hours",
+    "in 30 minutes", "in an hour",
+]
+
+# Things people really type that the templates do not produce
+HANDWRITTEN = [
+    "create schedule meeting today at 5pm with participant user@example.com",
+    "schedule email to user@example.com on 20 dec at 9:00 am about demo",
+    "remind me to call the bank first thing tomorrow",
+    "dentist next tuesday 4:45pm",
+    "meeting at 14:00 on the 3rd",
+    "pay electricity bill by end of month",
+    "team offsite friday through sunday",
+    "call back in a bit",
+    "lunch 12:30 tomorrow",
+    "yoga every monday at 7am",
+    "standup daily at 9:30am",
+    "submit timesheet eod",
+    "book flights asap",
+    "review pr after lunch",
+    "movie night saturday 8pm",
+    "report due 2026-12-01 17:00",
+    "pick up kids at 3:15 pm today",
+    "catch up with jo next wed afternoon",
+    "doctor 11/3 at 10:30am",
+    "quarterly review mar 31, 2027 at 2pm",
+]
+
+
+def build_corpus(size=3000, seed=2024):
+    """Return `size` phrases: the handwritten ones plus seeded template samples."""
+    rng = random.Random(seed)
+    phrases = list(HANDWRITTEN)
+    while len(phrases) < size:
+        command = rng.choice(COMMANDS).format(rng.choice(SUBJECTS))
+        day, time = rng.choice(DAYS), rng.choice(TIMES)
+        parts = [command, day, time] if rng.random() < 0.7 else [command, time, day]
+        phrases.append(" ".join(part for part in parts if part))
+    return phrases[:size]
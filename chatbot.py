@@ -3,6 +3,7 @@ import time
 import threading
 from datetime import datetime as dt, timedelta
 from rapidfuzz import process, fuzz
+from time_parser import SmartTimeParser
 
 try:
     from google_tasks import *
@@ -95,7 +96,7 @@ try:
         get_upcoming_events, search_events,delete_event,
         get_calendar_statistics, get_formatted_events_today,
         get_formatted_events_tomorrow, get_formatted_upcoming_events,reschedule_event,
-        parse_datetime_for_event
+        reschedule_event_series, parse_datetime_for_event
     )
     
     CALENDAR_AVAILABLE = True
@@ -105,7 +106,7 @@ except ImportError as e:
     print(f"Google Calendar module not available - {e}")
     CALENDAR_AVAILABLE = False
     
-    def create_event(user_input):
+    def create_event(user_input, recurrence=None):
         raise ImportError("Google Calendar module not available")
     
     def get_events_today():
@@ -120,263 +121,24 @@ except ImportError as e:
     def search_events(query):
         raise ImportError("Google Calendar module not available")
     
-    def delete_event(title, delete_all=False):
+    def delete_event(event_title=None, event_id=None):
         raise ImportError("Google Calendar module not available")
 
     def get_calendar_statistics():
         raise ImportError("Google Calendar module not available")
     
-    def get_formatted_events_today():
+    def get_formatted_events_today(limit=None):
         raise ImportError("Google Calendar module not available")
     
-    def get_formatted_events_tomorrow():
+    def get_formatted_events_tomorrow(limit=None):
         raise ImportError("Google Calendar module not available")
     
-    def get_formatted_upcoming_events(days=7):
+    def get_formatted_upcoming_events(days=7, limit=None):
         raise ImportError("Google Calendar module not available")
 
-class SmartTimeParser:
-    def __init__(self):
-        self.months = {
-            'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
-            'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
-            'aug': 8, 'august': 8, 'sep': 9, 'september': 9, 'oct': 10, 'october': 10,
-            'nov': 11, 'november': 11, 'dec': 12, 'december': 12
-        }
-
-    def extract_datetime(self, text):
-        """Extract datetime from natural language"""
-        text_lower = text.lower()
-        now = dt.now()
-        
-        target_date = self._extract_date(text_lower, now)
-        
-        hour, minute = self._extract_time(text_lower)
-        
-        try:
-            target_datetime = dt.combine(target_date, dt.min.time()).replace(hour=hour, minute=minute)
-            
-            if (target_datetime < now and 
-                'tomorrow' not in text_lower and 
-                'today' not in text_lower and
-                not any(month in text_lower for month in self.months.keys())):
-                target_datetime += timedelta(days=1)
-                
-            return target_datetime
-        except Exception:
-            return dt.combine(target_date + timedelta(days=1), dt.min.time()).replace(hour=hour, minute=minute)
-
-    def _extract_date(self, text, now):
-        """Extract date from text - IMPROVED to handle weekdays"""
-        text_lower = text.lower()
-        
-        weekdays = {
-            'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
-            'friday': 4, 'saturday': 5, 'sunday': 6,
-            'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6
-        }
-        
-        for day_name, day_num in weekdays.items():
-            if day_name in text_lower:
-                if f'next {day_name}' in text_lower:
-                    days_ahead = (day_num - now.weekday()) % 7
-                    if days_ahead <= 0:
-                        days_ahead += 7
-                    days_ahead += 7  
-                    return now.date() + timedelta(days=days_ahead)
-                else:
-                    days_ahead = (day_num - now.weekday()) % 7
-                    if days_ahead == 0:  
-                        days_ahead = 7
-                    return now.date() + timedelta(days=days_ahead)
-        
-        date_patterns = [
-            r'(\d{1,2})\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*',
-            r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(\d{1,2})'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, text_lower, re.IGNORECASE)
-            if match:
-                try:
-                    if match.group(1).isdigit():
-                        day = int(match.group(1))
-                        month_str = match.group(2).lower()[:3]
-                    else:
-                        day = int(match.group(2))
-                        month_str = match.group(1).lower()[:3]
-                    
-                    month = self.months.get(month_str, now.month)
-                    year = now.year
-                    
-                    target_date = dt(year, month, day).date()
-                    if target_date < now.date():
-                        target_date = target_date.replace(year=year + 1)
-                    return target_date
-                except (ValueError, IndexError):
-                    continue
-        
-        if 'today' in text_lower:
-            return now.date()
-        elif 'tomorrow' in text_lower and 'day after' not in text_lower:
-            return now.date() + timedelta(days=1)
-        elif 'day after tomorrow' in text_lower:
-            return now.date() + timedelta(days=2)
-        elif 'yesterday' in text_lower:
-            return now.date() - timedelta(days=1)
-        elif 'next week' in text_lower:
-            return now.date() + timedelta(days=7)
-        elif 'next month' in text_lower:
-            return now.date() + timedelta(days=30)
-        
-        return now.date()
-
-    def extract_datetime_for_email(self, text):
-
-        """Extract datetime specifically for email scheduling"""
-        text_lower = text.lower()
-        now = dt.now()
-        
-        print(f"DEBUG extract_datetime_for_email: parsing '{text}'")
-        print(f"DEBUG extract_datetime_for_email: full text lower: '{text_lower}'")
-        
-        hour, minute = self._extract_time(text_lower)
-        print(f"DEBUG extract_datetime_for_email: extracted time: {hour}:{minute:02d}")
-        
-        target_date = self._extract_date(text_lower, now)
-        print(f"DEBUG extract_datetime_for_email: extracted date: {target_date}")
-        
-        try:
-            target_datetime = dt.combine(target_date, dt.min.time()).replace(hour=hour, minute=minute)
-            
-            has_specific_date = any(pattern in text_lower for pattern in [
-                'jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'
-            ]) or re.search(r'\d{1,2}[/-]\d{1,2}', text_lower)
-            
-            if (target_datetime < now and not has_specific_date):
-                print(f"DEBUG: Time in past ({target_datetime}), moving to next day")
-                target_datetime += timedelta(days=1)
-            
-            print(f"DEBUG: Final datetime: {target_datetime}")
-            print(f"DEBUG: Final datetime formatted: {target_datetime.strftime('%Y-%m-%d %H:%M')}")
-            return target_datetime
-            
-        except Exception as e:
-            print(f"DEBUG: Error combining date/time: {e}")
-            fallback = now + timedelta(days=1)
-            fallback = fallback.replace(hour=hour, minute=minute)
-            return fallback
+    def reschedule_event_series(event_title=None, new_time_input=None, event_id=None, recurrence_input=None):
+        raise ImportError("Google Calendar module not available")
 
-    def _extract_time(self, text):
-        """Extract time from text - FIXED 12am/12pm handling"""
-        text_lower = text.lower()
-        
-        match = re.search(r'(\d{1,2}):(\d{2})\s*(am|pm)\b', text_lower, re.IGNORECASE)
-        if not match:
-            match = re.search(r'(\d{1,2}):(\d{2})(am|pm)\b', text_lower, re.IGNORECASE)
-        
-        if match:
-            try:
-                hour = int(match.group(1))
-                minute = int(match.group(2))
-                period = match.group(3).lower()
-                
-                if period == 'pm':
-                    if hour < 12:
-                        hour += 12
-                elif period == 'am':
-                    if hour == 12:
-                        hour = 0 
-                
-                if 0 <= hour <= 23 and 0 <= minute <= 59:
-                    print(f"DEBUG _extract_time: Found {hour}:{minute} from pattern 1")
-                    return hour, minute
-            except (ValueError, IndexError):
-                pass
-        
-        match = re.search(r'(\d{1,2})\s*(am|pm)\b', text_lower, re.IGNORECASE)
-        if not match:
-            match = re.search(r'(\d{1,2})(am|pm)\b', text_lower, re.IGNORECASE)
-        
-        if match:
-            try:
-                hour = int(match.group(1))
-                period = match.group(2).lower()
-                
-                if period == 'pm':
-                    if hour < 12:
-                        hour += 12
-                elif period == 'am':
-                    if hour == 12:
-                        hour = 0  
-                
-                if 0 <= hour <= 23:
-                    print(f"DEBUG _extract_time: Found {hour}:00 from pattern 2")
-                    return hour, 0
-            except (ValueError, IndexError):
-                pass
-        
-        match = re.search(r'(\d{1,2}):(\d{2})', text_lower)
-        if match:
-            try:
-                hour = int(match.group(1))
-                minute = int(match.group(2))
-                if 0 <= hour <= 23 and 0 <= minute <= 59:
-                    print(f"DEBUG _extract_time: Found {hour}:{minute} from pattern 3")
-                    return hour, minute
-            except (ValueError, IndexError):
-                pass
-        
-        match = re.search(r'\bat\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)?', text_lower, re.IGNORECASE)
-        if match:
-            try:
-                hour = int(match.group(1))
-                minute = int(match.group(2)) if match.group(2) else 0
-                period = match.group(3).lower() if match.group(3) else ''
-                
-                if period:
-                    if period == 'pm':
-                        if hour < 12:
-                            hour += 12
-                    elif period == 'am':
-                        if hour == 12:
-                            hour = 0
-                elif hour <= 11:
-                    hour += 12 
-                
-                if 0 <= hour <= 23 and 0 <= minute <= 59:
-                    print(f"DEBUG _extract_time: Found {hour}:{minute} from pattern 4")
-                    return hour, minute
-            except (ValueError, IndexError):
-                pass
-        
-        if any(word in text_lower for word in ['noon', 'midday']):
-            print(f"DEBUG _extract_time: Found noon from pattern 5")
-            return 12, 0
-        elif 'midnight' in text_lower:
-            print(f"DEBUG _extract_time: Found midnight from pattern 5")
-            return 0, 0
-        elif 'morning' in text_lower:
-            print(f"DEBUG _extract_time: Found morning from pattern 5")
-            return 9, 0
-        elif 'afternoon' in text_lower:
-            print(f"DEBUG _extract_time: Found afternoon from pattern 5")
-            return 14, 0
-        elif 'evening' in text_lower:
-            print(f"DEBUG _extract_time: Found evening from pattern 5")
-            return 18, 0
-        elif any(word in text_lower for word in ['night', 'tonight']):
-            print(f"DEBUG _extract_time: Found night from pattern 5")
-            return 20, 0
-        elif 'lunch' in text_lower:
-            print(f"DEBUG _extract_time: Found lunch from pattern 5")
-            return 12, 30
-        elif 'dinner' in text_lower:
-            print(f"DEBUG _extract_time: Found dinner from pattern 5")
-            return 19, 0
-        
-        print(f"DEBUG _extract_time: Using default time 14:00")
-        return 14, 0
 
 def extract_event_title(user_input):    
     "Extract clean event title - IMPROVED to handle 'on [day]'"
@@ -809,7 +571,8 @@ class SmartChatbot:
                 except TypeError:
                     print("  Google Calendar API doesn't accept separate parameters, using fallback")
                     processed_input = f"{clean_title} at {event_time.strftime('%I:%M %p')} on {event_time.strftime('%b %d')}"
-                    result = create_event(processed_input)
+                    # Keep any "every monday and wednesday" wording so the event is created as one series
+                    result = create_event(processed_input, recurrence=user_input)
             else:
                 raise ImportError("Google Calendar module not available")
             
@@ -861,8 +624,12 @@ class SmartChatbot:
         print(f"  Best match found: '{best_match}' with score: {score}")
         
         if best_match:
-            print(f"  Calling delete_event with: '{best_match}'")
-            result = delete_event(best_match)
+            event_id = next(
+                (e.get('id') for e in events if (e.get('summary') or 'No title') == best_match),
+                None
+            )
+            print(f"  Calling delete_event with: '{best_match}' ({event_id})")
+            result = delete_event(best_match, event_id=event_id)
             
             print(f"  Delete result: {result}")
             
@@ -879,18 +646,18 @@ class SmartChatbot:
         """View calendar events with exact titles"""
         try:
             if 'today' in text:
-                events = get_formatted_events_today()
+                events = get_formatted_events_today(limit=10)
                 title = "Today's Events"
             elif 'tomorrow' in text:
-                events = get_formatted_events_tomorrow()
+                events = get_formatted_events_tomorrow(limit=10)
                 title = "Tomorrow's Events"
             elif 'all' in text:
-                events = get_formatted_upcoming_events(30)
+                events = get_formatted_upcoming_events(30, limit=10)
                 title = "All Events"
             else:
                 days_match = re.search(r'(\d+)\s*days?', text)
                 days = int(days_match.group(1)) if days_match else 7
-                events = get_formatted_upcoming_events(days)
+                events = get_formatted_upcoming_events(days, limit=10)
                 title = f"Upcoming Events ({days} days)"
             
             if not events:
@@ -1288,7 +1055,7 @@ class SmartChatbot:
         
         if len(matching_events) == 1:
             event_title, event_data = matching_events[0]
-            result = reschedule_event(event_title, user_input)
+            result = reschedule_event(event_title, user_input, event_id=event_data.get('id'))
             self.caches['events'] = None
             if result.get('status') == 'success':
                 return result.get('message', f"Event '{event_title}' rescheduled")
@@ -1325,7 +1092,7 @@ class SmartChatbot:
                 if not new_time:
                     return "Reschedule cancelled - no time specified"
                 
-                result = reschedule_event(event_title, new_time)
+                result = reschedule_event(event_title, new_time, event_id=event_data.get('id'))
                 self.caches['events'] = None
                 if result.get('status') == 'success':
                     return result.get('message', f"Event '{event_title}' rescheduled")
@@ -1490,7 +1257,14 @@ class SmartChatbot:
             print(f"  Original title: '{original_title}'")
             print(f"  New time: '{new_time_text}'")
             
-            result = reschedule_event(original_title, new_time_text)
+            if event_data.get('recurringEventId') and re.search(r'\b(series|all occurrences|every occurrence)\b', user_input, re.IGNORECASE):
+                result = reschedule_event_series(original_title, new_time_text, event_id=event_data.get('id'))
+                self.caches['events'] = None
+                if result.get('status') == 'success':
+                    return f" {result.get('message')}"
+                return f" Failed to reschedule series: {result.get('message', 'Unknown error')}"
+
+            result = reschedule_event(original_title, new_time_text, event_id=event_data.get('id'))
             self.caches['events'] = None
             if result.get('status') == 'success':
                 return f" Event '{original_title}' rescheduled to {new_time_text}"
@@ -1530,7 +1304,7 @@ class SmartChatbot:
                 event_title, event_data, score = matching_events[selection_num - 1]
                 original_title = event_data.get('summary') or event_data.get('title') or event_title
                 
-                result = reschedule_event(original_title, new_time_text)
+                result = reschedule_event(original_title, new_time_text, event_id=event_data.get('id'))
                 self.caches['events'] = None
                 if result.get('status') == 'success':
                     return f"Event '{original_title}' rescheduled to {new_time_text}"
@@ -1558,6 +1332,7 @@ Calendar/Events:
 • show events today/tomorrow - View specific day events
 • delete event [name] - Delete an event
 • reschedule event [name] to [new time] - Move event to new time
+• reschedule event [name] series to [new time] - Move a whole recurring series
 
 Tasks:
 • create task [description] - Add new task
@@ -1,162 +1,27 @@
 import os
 import pickle
 import uuid
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from google.oauth2.credentials import Credentials
+from google_tasks import parse_recurrence_pattern
+from time_parser import SmartTimeParser, ParsePolicy, fallback_parse, match as match_phrase, parse_many
+import bisect
+import heapq
+import itertools
 import re
+import threading
+import time
 
 
 # Calendar API scope
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
 
-class SmartTimeParser:
-    """Time parsing utility for natural language"""
-    def __init__(self):
-        self.months = {
-            'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
-            'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
-            'aug': 8, 'august': 8, 'sep': 9, 'september': 9, 'oct': 10, 'october': 10,
-            'nov': 11, 'november': 11, 'dec': 12, 'december': 12
-        }
-
-    def extract_datetime(self, text):
-        """Extract datetime from natural language"""
-        text_lower = text.lower()
-        now = datetime.now()
-
-        # Extract date
-        target_date = self._extract_date(text_lower, now)
-
-        # Extract time
-        hour, minute = self._extract_time(text_lower)
-
-        # Combine date and time
-        try:
-            target_datetime = datetime.combine(
-                target_date, datetime.min.time()
-            ).replace(hour=hour, minute=minute)
-            return target_datetime
-        except Exception:
-            # Fallback
-            return datetime.combine(
-                target_date + timedelta(days=1),
-                datetime.min.time()
-            ).replace(hour=hour, minute=minute)
-
-    def _extract_date(self, text, now):
-        """Extract date from text"""
-        # Check for specific dates like "26 nov"
-        date_patterns = [
-            r'(\d{1,2})\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*',
-            r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(\d{1,2})'
-        ]
-
-        for pattern in date_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    if match.group(1).isdigit():
-                        day = int(match.group(1))
-                        month_str = match.group(2).lower()[:3]
-                    else:
-                        day = int(match.group(2))
-                        month_str = match.group(1).lower()[:3]
-
-                    month = self.months.get(month_str, now.month)
-                    year = now.year
-
-                    target_date = datetime(year, month, day).date()
-                    if target_date < now.date():
-                        target_date = target_date.replace(year=year + 1)
-                    return target_date
-                except (ValueError, IndexError):
-                    pass
-
-        # Check for date keywords
-        if 'tomorrow' in text:
-            return now.date() + timedelta(days=1)
-        elif 'day after tomorrow' in text:
-            return now.date() + timedelta(days=2)
-        elif 'yesterday' in text:
-            return now.date() - timedelta(days=1)
-        elif 'next week' in text:
-            return now.date() + timedelta(days=7)
-        elif 'next month' in text:
-            return now.date() + timedelta(days=30)
-
-        # Default to today
-        return now.date()
-
-    def _extract_time(self, text):
-        """Extract time from text"""
-        # Pattern 1: 12-hour with colon and am/pm "6:30 pm"
-        match = re.search(r'(\d{1,2}):(\d{2})\s*(am|pm)\b', text, re.IGNORECASE)
-        if match:
-            try:
-                hour = int(match.group(1))
-                minute = int(match.group(2))
-                period = match.group(3).lower()
-
-                if period == 'pm' and hour < 12:
-                    hour += 12
-                elif period == 'am' and hour == 12:
-                    hour = 0
-
-                if 0 <= hour <= 23 and 0 <= minute <= 59:
-                    return hour, minute
-            except (ValueError, IndexError):
-                pass
-
-        # Pattern 2: 12-hour without colon "6 pm"
-        match = re.search(r'(\d{1,2})\s*(am|pm)\b', text, re.IGNORECASE)
-        if match:
-            try:
-                hour = int(match.group(1))
-                period = match.group(2).lower()
-
-                if period == 'pm' and hour < 12:
-                    hour += 12
-                elif period == 'am' and hour == 12:
-                    hour = 0
-
-                if 0 <= hour <= 23:
-                    return hour, 0
-            except (ValueError, IndexError):
-                pass
-
-        # Pattern 3: 24-hour format "18:30"
-        match = re.search(r'(\d{1,2}):(\d{2})', text)
-        if match:
-            try:
-                hour = int(match.group(1))
-                minute = int(match.group(2))
-                if 0 <= hour <= 23 and 0 <= minute <= 59:
-                    return hour, minute
-            except (ValueError, IndexError):
-                pass
-
-        # Pattern 4: Natural language times
-        if any(word in text for word in ['noon', 'midday']):
-            return 12, 0
-        elif 'midnight' in text:
-            return 0, 0
-        elif 'morning' in text:
-            return 9, 0
-        elif 'afternoon' in text:
-            return 14, 0
-        elif 'evening' in text:
-            return 18, 0
-        elif any(word in text for word in ['night', 'tonight']):
-            return 20, 0
-
-        # Default to 2 PM
-        return 14, 0
-
-
 def extract_event_title(user_input):
     """Extract clean event title - STOPS AT FIRST STOPWORD"""
     print(f"DEBUG extract_event_title START:")
@@ -200,17 +65,29 @@ def extract_event_title(user_input):
     return title
 
 
-def get_calendar_service():
-    """Authenticate and return calendar service"""
-    creds = None
+# Token refresh happens this long before expiry, so no request goes out
+# with a token that is about to lapse.
+REFRESH_MARGIN = timedelta(minutes=5)
+
+CREDENTIALS_PATH = os.path.join('google_credentials', 'credentials.json')
+TOKEN_PATH = os.path.join('google_credentials', 'token_calendar.pickle')
 
-    # Use the google_credentials folder
-    credentials_path = os.path.join('google_credentials', 'credentials.json')
-    token_path = os.path.join('google_credentials', 'token_calendar.pickle')
+_creds_lock = threading.Lock()
+_creds = None
+_thread_local = threading.local()
+
+
+def _save_credentials(creds):
+    with open(TOKEN_PATH, 'wb') as token:
+        pickle.dump(creds, token)
+
+
+def _load_credentials():
+    creds = None
 
     # Token file stores user access/refresh tokens
-    if os.path.exists(token_path):
-        with open(token_path, 'rb') as token:
+    if os.path.exists(TOKEN_PATH):
+        with open(TOKEN_PATH, 'rb') as token:
             creds = pickle.load(token)
 
     # If no valid credentials, log in
@@ -218,65 +95,827 @@ def get_calendar_service():
         if creds and creds.expired and creds.refresh_token:
             creds.refresh(Request())
         else:
-            if not os.path.exists(credentials_path):
-                print(f"Calendar credentials file '{credentials_path}' not found.")
+            if not os.path.exists(CREDENTIALS_PATH):
+                print(f"Calendar credentials file '{CREDENTIALS_PATH}' not found.")
                 print("Please download from Google Cloud Console and save in google_credentials folder.")
                 return None
-            flow = InstalledAppFlow.from_client_secrets_file(credentials_path, SCOPES)
+            flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_PATH, SCOPES)
             creds = flow.run_local_server(port=0)
 
         # Save credentials for next run
-        with open(token_path, 'wb') as token:
-            pickle.dump(creds, token)
+        _save_credentials(creds)
+
+    return creds
+
+
+def _expiring(creds):
+    if not creds.valid:
+        return True
+    expiry = getattr(creds, 'expiry', None)
+    return expiry is not None and expiry - datetime.utcnow() < REFRESH_MARGIN
+
+
+def _get_credentials():
+    """Return the process-wide credentials, refreshing them shortly before expiry"""
+    global _creds
+    with _creds_lock:
+        if _creds is None:
+            _creds = _load_credentials()
+        elif _expiring(_creds):
+            if _creds.refresh_token:
+                _creds.refresh(Request())
+                _save_credentials(_creds)
+            else:
+                _creds = _load_credentials()
+        return _creds
+
+
+def get_calendar_service():
+    """
+    Authenticate and return calendar service.
+
+    Credentials are loaded once per process and refreshed in place; the
+    client itself is built once per thread (the underlying HTTP connection
+    is not thread-safe) and reused by every calendar function.
+    """
+    creds = _get_credentials()
+    if not creds:
+        return None
+
+    service = getattr(_thread_local, 'service', None)
+    if service is None or _thread_local.creds is not creds:
+        service = build('calendar', 'v3', credentials=creds, cache_discovery=False)
+        _thread_local.service = service
+        _thread_local.creds = creds
+    return service
+
 
-    return build('calendar', 'v3', credentials=creds)
+def reset_calendar_service():
+    """Forget cached credentials and clients so the next call re-reads the token file"""
+    global _creds
+    with _creds_lock:
+        _creds = None
+    _thread_local.__dict__.clear()
 
 
-def create_event(user_input):
-    """Create calendar event with Google Meet link from natural language."""
+# ---------------------------------------------------------------------------
+# Local event store kept current with incremental (syncToken) sync
+# ---------------------------------------------------------------------------
+
+EVENT_CACHE_PATH = os.path.join('google_credentials', 'calendar_cache.pickle')
+EVENT_FIELDS = (
+    'nextPageToken,nextSyncToken,'
+    'items(id,status,summary,description,location,start,end,hangoutLink,attendees(email),recurringEventId,'
+    'transparency,iCalUID)'
+)
+SYNC_PAGE_SIZE = 2500
+# Reads within this many seconds of the last sync are served without a delta call
+SYNC_INTERVAL = 5
+
+
+def _normalize_summary(summary):
+    return ' '.join((summary or '').lower().split())
+
+
+def _event_timestamp(when):
+    """Epoch seconds for an event 'start'/'end' object (all-day dates are local midnight)"""
+    if 'dateTime' in when:
+        return datetime.fromisoformat(when['dateTime'].replace('Z', '+00:00')).timestamp()
+    return datetime.strptime(when['date'], '%Y-%m-%d').timestamp()
+
+
+class EventRecord:
+    """
+    The parts of a calendar event the assistant reads, parsed once when the
+    event is fetched instead of on every view. Times are epoch seconds
+    (all-day events run between local midnights); description, location
+    and attendee emails survive only as lower-cased search text.
+    Transparent events ("show me as available") do not block free time.
+    """
+
+    __slots__ = ('id', 'summary', 'start', 'end', 'all_day', 'meet_link', 'recurring_id', 'search_text',
+                 'transparent', 'ical_uid')
+
+    def __init__(self, id, summary='', start=0.0, end=0.0, all_day=False,
+                 meet_link=None, recurring_id=None, search_text='', transparent=False, ical_uid=None):
+        self.id = id
+        self.summary = summary
+        self.start = start
+        self.end = end
+        self.all_day = all_day
+        self.meet_link = meet_link
+        self.recurring_id = recurring_id
+        self.search_text = search_text
+        self.transparent = transparent
+        self.ical_uid = ical_uid
+
+    def __setstate__(self, state):
+        # Records pickled before a slot was added leave it at its default
+        self.__init__(None)
+        for name, value in state[1].items():
+            setattr(self, name, value)
+
+    @classmethod
+    def from_api(cls, event):
+        """Record for an API event payload, or None when it has no usable times"""
+        try:
+            start, end = _event_timestamp(event['start']), _event_timestamp(event['end'])
+        except (KeyError, ValueError):
+            return None
+        search_text = ' '.join(filter(None, [
+            event.get('description'),
+            event.get('location'),
+            ' '.join(a.get('email', '') for a in event.get('attendees', [])),
+        ])).lower()
+        return cls(
+            event['id'], event.get('summary', ''), start, end, 'date' in event['start'],
+            event.get('hangoutLink'), event.get('recurringEventId'), search_text,
+            event.get('transparency') == 'transparent', event.get('iCalUID'),
+        )
+
+    @property
+    def start_datetime(self):
+        return datetime.fromtimestamp(self.start)
+
+    @property
+    def end_datetime(self):
+        return datetime.fromtimestamp(self.end)
+
+    def to_dict(self):
+        """API-shaped dict for callers that still read raw event payloads"""
+        if self.all_day:
+            start = {'date': self.start_datetime.strftime('%Y-%m-%d')}
+            end = {'date': self.end_datetime.strftime('%Y-%m-%d')}
+        else:
+            start = {'dateTime': self.start_datetime.astimezone().isoformat()}
+            end = {'dateTime': self.end_datetime.astimezone().isoformat()}
+        event = {'id': self.id, 'summary': self.summary, 'start': start, 'end': end}
+        if self.meet_link:
+            event['hangoutLink'] = self.meet_link
+        if self.recurring_id:
+            event['recurringEventId'] = self.recurring_id
+        return event
+
+    def __repr__(self):
+        return f'EventRecord({self.id!r}, {self.summary!r}, {self.start_datetime:%Y-%m-%d %H:%M})'
+
+
+class _IntervalIndex:
+    """
+    Event intervals as (start, end, event_id) keys sorted by start.
+
+    Events up to SHORT_SPAN long sit in one list with a parallel list of
+    starts for bisect: anything of theirs overlapping [t0, t1) starts
+    before t1 and no earlier than t0 - SHORT_SPAN, so a query is two binary
+    searches plus a scan of that band. Longer events (vacations, multi-day
+    blocks) are few and kept in a separate list that is scanned whole, so
+    one of them never widens the band for every other query.
+    """
+    SHORT_SPAN = 25 * 3600  # an all-day event, even across a DST change
+
+    def __init__(self):
+        self._keys = []
+        self._starts = []
+        self._long = []
+
+    def rebuild(self, records):
+        keys = sorted((record.start, record.end, record.id) for record in records)
+        self._keys = [key for key in keys if key[1] - key[0] <= self.SHORT_SPAN]
+        self._starts = [key[0] for key in self._keys]
+        self._long = [key for key in keys if key[1] - key[0] > self.SHORT_SPAN]
+
+    def add(self, event_id, start, end):
+        key = (start, end, event_id)
+        if end - start > self.SHORT_SPAN:
+            bisect.insort(self._long, key)
+            return
+        i = bisect.bisect_left(self._keys, key)
+        self._keys.insert(i, key)
+        self._starts.insert(i, start)
+
+    def remove(self, event_id, start, end):
+        key = (start, end, event_id)
+        if end - start > self.SHORT_SPAN:
+            i = bisect.bisect_left(self._long, key)
+            if i < len(self._long) and self._long[i] == key:
+                del self._long[i]
+            return
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+            del self._starts[i]
+
+    def candidates(self, t0=None, t1=None):
+        """Keys that may overlap [t0, t1), in start order (callers still check end > t0)"""
+        lo = 0 if t0 is None else bisect.bisect_right(self._starts, t0 - self.SHORT_SPAN)
+        hi = len(self._keys) if t1 is None else bisect.bisect_left(self._starts, t1)
+        long_keys = [key for key in self._long
+                     if (t1 is None or key[0] < t1) and (t0 is None or key[1] > t0)]
+        if not long_keys:
+            return self._keys[lo:hi]
+        return list(heapq.merge(self._keys[lo:hi], long_keys))
+
+
+class _EventStore:
+    """
+    All events of one calendar as EventRecords, held in memory and pickled
+    to disk.
+
+    The first sync lists everything; later syncs pass the saved
+    nextSyncToken so only events changed since then (including
+    cancellations) come back. A 410 Gone means the token expired and the
+    store is rebuilt from a full sync.
+    """
+
+    def __init__(self, path, calendar_id='primary'):
+        self.path = path
+        self.calendar_id = calendar_id
+        self.last_sync = 0.0
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._events = {}
+        self._sync_token = None
+        self._index = _IntervalIndex()
+        self._index_stale = True
+        self._by_summary = {}
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'rb') as f:
+                    state = pickle.load(f)
+                self._sync_token = state['sync_token']
+                for event in state['events']:
+                    # caches written before records were introduced hold raw payloads
+                    self._put(event) if isinstance(event, dict) else self._put_record(event)
+            except Exception as e:
+                print(f"Ignoring unreadable calendar cache: {e}")
+                self._reset()
+
+    def _save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'sync_token': self._sync_token, 'events': list(self._events.values())}, f)
+        os.replace(tmp_path, self.path)
+
+    def _reset(self):
+        self._events.clear()
+        self._by_summary.clear()
+        self._sync_token = None
+        self._index_stale = True
+
+    def _put(self, event):
+        if event.get('status') == 'cancelled':
+            self._drop(event['id'])
+            return
+        record = EventRecord.from_api(event)
+        if record is not None:
+            self._put_record(record)
+
+    def _put_record(self, record):
+        self._drop(record.id)
+        self._events[record.id] = record
+        self._by_summary.setdefault(_normalize_summary(record.summary), set()).add(record.id)
+        if not self._index_stale:
+            self._index.add(record.id, record.start, record.end)
+
+    def _drop(self, event_id):
+        record = self._events.pop(event_id, None)
+        if record is not None:
+            key = _normalize_summary(record.summary)
+            ids = self._by_summary.get(key)
+            if ids is not None:
+                ids.discard(event_id)
+                if not ids:
+                    del self._by_summary[key]
+            if not self._index_stale:
+                self._index.remove(event_id, record.start, record.end)
+
+    def _list_pages(self, service, **params):
+        page_token = None
+        while True:
+            result = service.events().list(
+                calendarId=self.calendar_id,
+                singleEvents=True,
+                showDeleted=True,
+                maxResults=SYNC_PAGE_SIZE,
+                fields=EVENT_FIELDS,
+                pageToken=page_token,
+                **params
+            ).execute()
+            yield result
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                return
+
+    def sync(self, service):
+        """Pull changes since the last sync; returns the number of changed events"""
+        with self._lock:
+            self._load()
+            try:
+                changed = self._pull(service, self._sync_token)
+            except HttpError as e:
+                if e.resp.status != 410 or self._sync_token is None:
+                    raise
+                # Sync token expired: start over from a full sync
+                self._reset()
+                changed = self._pull(service, None)
+            if changed:
+                self._save()
+            self.last_sync = time.time()
+            return changed
+
+    def _pull(self, service, sync_token):
+        params = {'syncToken': sync_token} if sync_token else {}
+        changed = 0
+        next_token = None
+        full = sync_token is None
+        seen = {}
+        for page in self._list_pages(service, **params):
+            for event in page.get('items', []):
+                if not full:
+                    self._put(event)
+                elif event.get('status') == 'cancelled':
+                    seen.pop(event['id'], None)
+                else:
+                    seen[event['id']] = EventRecord.from_api(event)
+                changed += 1
+            next_token = page.get('nextSyncToken', next_token)
+        if full:
+            self._reset()
+            for record in seen.values():
+                if record is not None:
+                    self._put_record(record)
+        self._sync_token = next_token
+        return changed
+
+    def apply_local(self, *events):
+        """Record writes made by this process; the sync token is left alone"""
+        with self._lock:
+            self._load()
+            for event in events:
+                self._put(event)
+            self._save()
+
+    def remove(self, event_id):
+        with self._lock:
+            self._load()
+            self._drop(event_id)
+            self._save()
+
+    def iter_spans(self, time_min=None, time_max=None):
+        """
+        Yield (start, end, record) for events overlapping [time_min, time_max)
+        (epoch seconds) in start order, stopping at the first event that
+        starts after the window.
+        """
+        with self._lock:
+            self._load()
+            if self._index_stale:
+                self._index.rebuild(self._events.values())
+                self._index_stale = False
+            candidates = self._index.candidates(time_min, time_max)
+            events = self._events
+        for start, end, event_id in candidates:
+            record = events.get(event_id)
+            if record is not None and (time_min is None or end > time_min):
+                yield start, end, record
+
+    def get(self, event_id):
+        with self._lock:
+            self._load()
+            return self._events.get(event_id)
+
+    def find_by_summary(self, summary, time_min=None):
+        """Events titled `summary` (case/space-insensitive) ending after time_min, earliest first"""
+        with self._lock:
+            self._load()
+            ids = self._by_summary.get(_normalize_summary(summary), ())
+            matches = [
+                self._events[event_id] for event_id in ids
+                if time_min is None or self._events[event_id].end > time_min
+            ]
+        matches.sort(key=lambda record: record.start)
+        return matches
+
+    def spans(self, time_min=None, time_max=None):
+        return list(self.iter_spans(time_min, time_max))
+
+    def events(self, time_min=None, time_max=None):
+        """Records overlapping [time_min, time_max) (epoch seconds), ordered by start"""
+        return [record for _, _, record in self.iter_spans(time_min, time_max)]
+
+
+_event_store = _EventStore(EVENT_CACHE_PATH)
+
+
+# ---------------------------------------------------------------------------
+# All selected calendars: one store each, synced concurrently, read merged
+# ---------------------------------------------------------------------------
+
+CALENDAR_LIST_FIELDS = 'nextPageToken,items(id,primary,selected)'
+# The calendar list rarely changes; re-read it at most this often (seconds)
+CALENDAR_LIST_TTL = 600
+FETCH_WORKERS = 8
+
+_stores = {'primary': _event_store}
+_stores_lock = threading.Lock()
+_calendar_ids = None
+_calendar_ids_at = 0.0
+_sync_pool = None
+
+
+def _store_for(calendar_id):
+    with _stores_lock:
+        store = _stores.get(calendar_id)
+        if store is None:
+            safe_id = re.sub(r'[^\w.-]', '_', calendar_id)
+            path = os.path.join('google_credentials', f'calendar_cache_{safe_id}.pickle')
+            store = _stores[calendar_id] = _EventStore(path, calendar_id)
+        return store
+
+
+def list_calendars(service=None, refresh=False):
+    """IDs of the calendars selected in the user's calendar list, 'primary' first"""
+    global _calendar_ids, _calendar_ids_at
+    if not refresh and _calendar_ids is not None and time.time() - _calendar_ids_at < CALENDAR_LIST_TTL:
+        return _calendar_ids
+
+    calendar_ids = ['primary']
     try:
-        service = get_calendar_service()
-        if not service:
-            return {
-                'status': 'error',
-                'message': 'Calendar authentication failed. Check credentials.'
-            }
+        service = service or get_calendar_service()
+        page_token = None
+        while service:
+            result = service.calendarList().list(
+                fields=CALENDAR_LIST_FIELDS, maxResults=250, pageToken=page_token
+            ).execute()
+            for item in result.get('items', []):
+                if item.get('selected') and not item.get('primary'):
+                    calendar_ids.append(item['id'])
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                break
+    except Exception as e:
+        print(f"Could not list calendars, using primary only: {e}")
+        calendar_ids = ['primary']
 
-        parser = SmartTimeParser()
-        event_time = parser.extract_datetime(user_input)
-        title = extract_event_title(user_input)
+    _calendar_ids, _calendar_ids_at = calendar_ids, time.time()
+    return calendar_ids
 
-        # Start/end time in ISO
-        start_time = event_time.isoformat()
-        end_time = (event_time + timedelta(hours=1)).isoformat()  # 1 hour default
 
-        # Optional: extract attendee email from the input
-        email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', user_input)
-        attendee_email = email_match.group(0) if email_match else None
+def _get_sync_pool():
+    global _sync_pool
+    with _stores_lock:
+        if _sync_pool is None:
+            _sync_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='calendar-sync')
+        return _sync_pool
 
-        event_body = {
-            'summary': title,
-            'description': f'Created from personal assistant: {user_input}',
-            'start': {
-                'dateTime': start_time,
-                'timeZone': 'America/New_York',  # adjust timezone as needed
-            },
-            'end': {
-                'dateTime': end_time,
-                'timeZone': 'America/New_York',
-            },
+
+def _sync_store(store):
+    # get_calendar_service() hands each worker thread its own client
+    return store.sync(get_calendar_service())
+
+
+def _distinct_spans(spans):
+    """
+    Drop repeat copies of one event seen on two calendars (an invite on
+    the primary calendar and on a shared one). Copies share an iCalUID
+    (or an ID) and times, and a start-ordered stream puts them next to
+    each other, so only keys at the current start are remembered.
+    """
+    current, seen = None, set()
+    for span in spans:
+        start, end, record = span
+        if start != current:
+            current, seen = start, set()
+        key = (record.ical_uid or record.id, end)
+        if key not in seen:
+            seen.add(key)
+            yield span
+
+
+class _Timeline:
+    """
+    Read-only view over several calendars' stores. Each store streams its
+    events in start order, so they are combined with a k-way heap merge
+    that yields an event on several calendars once.
+    """
+
+    def __init__(self, stores):
+        self.stores = stores
+
+    def iter_spans(self, time_min=None, time_max=None):
+        streams = [store.iter_spans(time_min, time_max) for store in self.stores]
+        if len(streams) == 1:
+            return streams[0]
+        return _distinct_spans(heapq.merge(*streams, key=lambda span: span[0]))
+
+    def spans(self, time_min=None, time_max=None):
+        return list(self.iter_spans(time_min, time_max))
+
+    def events(self, time_min=None, time_max=None):
+        return [event for _, _, event in self.iter_spans(time_min, time_max)]
+
+    def locate(self, event_id):
+        """(store, event) holding this event ID, or (None, None)"""
+        for store in self.stores:
+            event = store.get(event_id)
+            if event is not None:
+                return store, event
+        return None, None
+
+    def locate_by_summary(self, summary, time_min=None):
+        """(store, event) pairs titled `summary`, earliest start first"""
+        matches = [
+            (store, event) for store in self.stores
+            for event in store.find_by_summary(summary, time_min)
+        ]
+        matches.sort(key=lambda match: match[1].start)
+        return matches
+
+
+def _local_timeline():
+    """The selected calendars as last synced, without touching the API"""
+    return _Timeline([_store_for(calendar_id) for calendar_id in (_calendar_ids or ['primary'])])
+
+
+def sync_events(force=False):
+    """
+    Bring the stores of all selected calendars up to date, fetching them
+    concurrently, and return a merged timeline over them (None when the
+    calendar is unreachable). Unless forced, a sync younger than
+    SYNC_INTERVAL seconds is reused.
+    """
+    service = get_calendar_service()
+    if not service:
+        return None
+    stores = [_store_for(calendar_id) for calendar_id in list_calendars(service)]
+    stale = [store for store in stores if force or time.time() - store.last_sync >= SYNC_INTERVAL]
+
+    if len(stale) == 1:
+        stale[0].sync(service)
+    elif stale:
+        pool = _get_sync_pool()
+        futures = [(store, pool.submit(_sync_store, store)) for store in stale]
+        for store, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                if store is _event_store:
+                    raise
+                # A shared calendar failing should not take the primary one down with it
+                print(f"Error syncing calendar {store.calendar_id}: {e}")
+    return _Timeline(stores)
+
+
+def _day_start(dt):
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _epoch(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return value.timestamp()
+
+
+def iter_events(time_min=None, time_max=None):
+    """
+    Stream EventRecords overlapping [time_min, time_max) in start order.
+
+    Bounds are datetimes (naive means local time) or epoch seconds; None
+    leaves that side open. There is no result cap: the store behind this
+    is filled with paginated, field-masked syncs, and callers that only
+    show a few rows can stop iterating early.
+    """
+    timeline = sync_events()
+    if not timeline:
+        return
+    for _, _, record in timeline.iter_spans(_epoch(time_min), _epoch(time_max)):
+        yield record
+
+
+def find_conflicts(start, end, exclude_id=None):
+    """
+    Timed events overlapping [start, end), answered from the local store
+    without an API call. All-day events are not treated as conflicts.
+    """
+    return [
+        record for record in _local_timeline().events(_epoch(start), _epoch(end))
+        if not record.all_day and record.id != exclude_id
+    ]
+
+
+def is_slot_free(start, end):
+    """True when no timed event overlaps [start, end)"""
+    return not find_conflicts(start, end)
+
+
+def _conflict_note(conflicts):
+    if not conflicts:
+        return ''
+    return ' (overlaps with: ' + ', '.join(record.summary or 'No title' for record in conflicts) + ')'
+
+
+def _resolve_event(event_title=None, event_id=None):
+    """
+    The (store, event) a mutation targets: the given ID, or else the next
+    upcoming event with this exact title from the local summary indexes.
+    Only a miss costs a sync, so a resolved mutation is a single API call.
+    The store tells which calendar the event lives on.
+    """
+    if event_id:
+        store, event = _local_timeline().locate(event_id)
+        if event is None:
+            return _event_store, EventRecord(event_id, event_title or '')
+        return store, event
+    for attempt in range(2):
+        timeline = sync_events(force=True) if attempt else _local_timeline()
+        matches = timeline.locate_by_summary(event_title, time.time()) if timeline else []
+        if matches:
+            return matches[0]
+    return None, None
+
+
+# ---------------------------------------------------------------------------
+# Recurring events: one series with an RRULE instead of one event per date
+# ---------------------------------------------------------------------------
+
+RRULE_WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+# "... until dec 31" ends a series on that date; the clause is not part of the start time
+UNTIL_RE = re.compile(r'\buntil\s+(.+?)\s*(?=\bat\b|\bfrom\b|$)')
+
+
+def recurrence_rule(pattern_type, details, count=None, until=None):
+    """
+    RRULE line for a google_tasks.parse_recurrence_pattern() result. The
+    series is open-ended unless a COUNT or an UNTIL date is given.
+    """
+    if pattern_type == 'daily':
+        rule = f"RRULE:FREQ=DAILY;INTERVAL={details.get('interval', 1)}"
+    elif pattern_type == 'weekly':
+        rule = f"RRULE:FREQ=WEEKLY;BYDAY={RRULE_WEEKDAYS[details['weekday']]}"
+    elif pattern_type == 'weekly_multiple':
+        rule = 'RRULE:FREQ=WEEKLY;BYDAY=' + ','.join(RRULE_WEEKDAYS[d] for d in sorted(set(details['weekdays'])))
+    elif pattern_type == 'monthly':
+        rule = f"RRULE:FREQ=MONTHLY;BYMONTHDAY={details['day']}"
+    else:
+        return None
+    if count:
+        rule += f';COUNT={count}'
+    elif until:
+        # Last instant of that day, in UTC as RFC 5545 requires with a timed start
+        last = datetime.combine(until, datetime.max.time()).astimezone(timezone.utc)
+        rule += f';UNTIL={last:%Y%m%dT%H%M%SZ}'
+    return rule
+
+
+def parse_recurrence(text):
+    """
+    Recurrence wording in `text` as (rrule, pattern_type, details), or
+    (None, None, None). "... 10 times" or "... until dec 31" bounds the
+    series; otherwise it is open-ended.
+    """
+    pattern_type, details = parse_recurrence_pattern(text)
+    if not pattern_type:
+        return None, None, None
+    text = text.lower()
+    count_match = re.search(r'\b(\d+)\s+(?:times|occurrences)\b', text)
+    count = int(count_match.group(1)) if count_match else None
+    until = None
+    until_match = UNTIL_RE.search(text)
+    if until_match:
+        until_time = match_phrase(until_match.group(1))
+        until = until_time.date() if until_time else None
+    return recurrence_rule(pattern_type, details, count, until), pattern_type, details
+
+
+def without_until(text):
+    """`text` minus any "until <date>" clause, so the end date is not read as the start"""
+    return UNTIL_RE.sub('', text).strip()
+
+
+def _first_occurrence(start, pattern_type, details):
+    """Move `start` forward to the first date the pattern produces"""
+    if pattern_type == 'weekly':
+        matches = lambda dt: dt.weekday() == details['weekday']
+    elif pattern_type == 'weekly_multiple':
+        matches = lambda dt: dt.weekday() in details['weekdays']
+    elif pattern_type == 'monthly':
+        matches = lambda dt: dt.day == details['day']
+    else:
+        return start
+    for _ in range(366):
+        if matches(start):
+            break
+        start += timedelta(days=1)
+    return start
+
+
+def _parse_new_time(new_time_input):
+    """New start time from 'YYYY-MM-DD HH:MM', 'YYYY-MM-DD' (2 PM) or natural language"""
+    try:
+        return datetime.strptime(new_time_input, "%Y-%m-%d %H:%M")
+    except ValueError:
+        try:
+            new_time = datetime.strptime(new_time_input, "%Y-%m-%d")
+            return new_time.replace(hour=14, minute=0)  # 2 PM default
+        except ValueError:
+            parser = SmartTimeParser()
+            return parser.extract_datetime(new_time_input)
+
+
+def _build_event(user_input, event_time, recurrence=None):
+    """Return (title, event_time, rrule, conflicts, insert_body) for one sentence."""
+    title = extract_event_title(without_until(user_input))
+
+    rrule, pattern_type, details = parse_recurrence(recurrence or user_input)
+    if rrule:
+        event_time = _first_occurrence(event_time, pattern_type, details)
+
+    # Start/end time in ISO
+    start_time = event_time.isoformat()
+    end_time = (event_time + timedelta(hours=1)).isoformat()  # 1 hour default
+    conflicts = find_conflicts(event_time, event_time + timedelta(hours=1))
+
+    # Optional: extract attendee email from the input
+    email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', user_input)
+    attendee_email = email_match.group(0) if email_match else None
+
+    event_body = {
+        'summary': title,
+        'description': f'Created from personal assistant: {user_input}',
+        'start': {
+            'dateTime': start_time,
+            'timeZone': 'America/New_York',  # adjust timezone as needed
+        },
+        'end': {
+            'dateTime': end_time,
+            'timeZone': 'America/New_York',
+        },
+    }
+
+    if attendee_email:
+        event_body['attendees'] = [{'email': attendee_email}]
+
+    if rrule:
+        event_body['recurrence'] = [rrule]
+
+    # Request a Google Meet link
+    event_body['conferenceData'] = {
+        'createRequest': {
+            'requestId': str(uuid.uuid4()),
+            'conferenceSolutionKey': {'type': 'hangoutsMeet'},
         }
+    }
+    return title, event_time, rrule, conflicts, event_body
+
+
+def _record_created(created):
+    """Fold [(rrule, created_event)] into the local store with a single save"""
+    singles = [event for rrule, event in created if not rrule]
+    if len(singles) < len(created):
+        # The store holds expanded instances; they arrive with the next delta sync
+        _event_store.last_sync = 0
+    if singles:
+        _event_store.apply_local(*singles)
+
+
+def _created_result(title, event_time, rrule, conflicts, created_event):
+    return {
+        'status': 'success',
+        'title': title,
+        'start_time': event_time.strftime("%Y-%m-%d %H:%M"),
+        'event_id': created_event.get('id'),
+        'meet_link': created_event.get('hangoutLink'),
+        'recurrence': rrule,
+        'conflicts': [record.summary or 'No title' for record in conflicts],
+        'message': 'Event created successfully in Google Calendar' + _conflict_note(conflicts)
+    }
 
-        if attendee_email:
-            event_body['attendees'] = [{'email': attendee_email}]
 
-        # Request a Google Meet link
-        event_body['conferenceData'] = {
-            'createRequest': {
-                'requestId': str(uuid.uuid4()),
-                'conferenceSolutionKey': {'type': 'hangoutsMeet'},
+def create_event(user_input, recurrence=None):
+    """
+    Create calendar event with Google Meet link from natural language.
+
+    Recurrence wording ("daily at 9am", "every monday and wednesday", ...) in
+    `recurrence`, or else in `user_input`, makes a single recurring event
+    with an RRULE rather than one event per occurrence.
+    """
+    try:
+        service = get_calendar_service()
+        if not service:
+            return {
+                'status': 'error',
+                'message': 'Calendar authentication failed. Check credentials.'
             }
-        }
+
+        parser = SmartTimeParser()
+        event_time = parser.extract_datetime(without_until(user_input))
+        title, event_time, rrule, conflicts, event_body = _build_event(user_input, event_time, recurrence)
 
         created_event = service.events().insert(
             calendarId='primary',
@@ -285,42 +924,116 @@ def create_event(user_input):
             sendUpdates='all'
         ).execute()
 
-        meet_link = created_event.get('hangoutLink')
-
-        return {
-            'status': 'success',
-            'title': title,
-            'start_time': event_time.strftime("%Y-%m-%d %H:%M"),
-            'event_id': created_event.get('id'),
-            'meet_link': meet_link,
-            'message': 'Event created successfully in Google Calendar'
-        }
+        _record_created([(rrule, created_event)])
+        return _created_result(title, event_time, rrule, conflicts, created_event)
 
     except Exception as e:
         return {'status': 'error', 'message': f'Failed to create event: {str(e)}'}
 
 
-def delete_event(event_title):
-    """Delete event by title"""
+# Calendar batch requests take at most 50 calls
+BATCH_SIZE = 50
+
+
+def _execute_batched(service, requests):
+    """
+    Run [(key, HttpRequest)] through BatchHttpRequest in chunks of BATCH_SIZE.
+    Returns {key: (response, exception)}. A chunk whose batch call fails
+    outright reports that error for each of its calls not already answered;
+    the other chunks still run.
+    """
+    results = {}
+
+    def callback(request_id, response, exception):
+        results[request_id] = (response, exception)
+
+    for start in range(0, len(requests), BATCH_SIZE):
+        chunk = requests[start:start + BATCH_SIZE]
+        try:
+            batch = service.new_batch_http_request(callback=callback)
+            for key, request in chunk:
+                batch.add(request, request_id=key)
+            batch.execute()
+        except Exception as e:
+            print(f"Batch of {len(chunk)} event inserts failed: {e}")
+            for key, _ in chunk:
+                results.setdefault(key, (None, e))
+    return results
+
+
+def create_events(user_inputs):
+    """
+    Create many events from natural sentences with batched inserts.
+
+    Start times come from one parse_many() pass, so a backlog full of
+    repeated phrasings is parsed once per distinct phrase. Returns one
+    result dict per input, in order (same shape as create_event).
+    """
+    user_inputs = list(user_inputs)
+    try:
+        service = get_calendar_service()
+    except Exception as e:
+        service = None
+        print(f"Error getting calendar service: {e}")
+    if not service:
+        message = 'Calendar authentication failed. Check credentials.'
+        return [{'status': 'error', 'message': message} for _ in user_inputs]
+
+    now = datetime.now()
+    timestamps, _ = parse_many([without_until(text) for text in user_inputs], now)
+
+    built, errors, requests = {}, {}, []
+    for i, (text, stamp) in enumerate(zip(user_inputs, timestamps)):
+        try:
+            built[i] = _build_event(text, datetime.fromtimestamp(stamp))
+            requests.append((str(i), service.events().insert(
+                calendarId='primary',
+                body=built[i][4],
+                conferenceDataVersion=1,
+                sendUpdates='all'
+            )))
+        except Exception as e:
+            errors[i] = e
+    responses = _execute_batched(service, requests)
+
+    results, created = [], []
+    for i in range(len(user_inputs)):
+        if i in errors:
+            results.append({'status': 'error', 'message': f'Failed to create event: {errors[i]}'})
+            continue
+        title, event_time, rrule, conflicts, _ = built[i]
+        created_event, error = responses.get(str(i), (None, None))
+        if error is not None or not created_event:
+            results.append({'status': 'error', 'title': title, 'message': f'Failed to create event: {error}'})
+            continue
+        created.append((rrule, created_event))
+        results.append(_created_result(title, event_time, rrule, conflicts, created_event))
+    _record_created(created)
+    return results
+
+
+def delete_event(event_title=None, event_id=None):
+    """Delete event by ID, or by title when no ID is given"""
     try:
         service = get_calendar_service()
         if not service:
             return {'status': 'error', 'message': 'Calendar authentication failed'}
 
-        # Search for events with matching title
-        events = get_upcoming_events(30)
-        event_to_delete = None
-
-        for event in events:
-            if event.get('summary', '').lower() == event_title.lower():
-                event_to_delete = event
-                break
+        store, event_to_delete = _resolve_event(event_title, event_id)
 
         if not event_to_delete:
             return {'status': 'error', 'message': f'Event "{event_title}" not found'}
+        event_title = event_title or event_to_delete.summary or event_to_delete.id
 
         # Delete the event
-        service.events().delete(calendarId='primary', eventId=event_to_delete['id']).execute()
+        try:
+            service.events().delete(calendarId=store.calendar_id, eventId=event_to_delete.id).execute()
+        except HttpError as e:
+            if e.resp.status not in (404, 410):
+                raise
+            store.remove(event_to_delete.id)
+            return {'status': 'error', 'message': f'Event "{event_title}" not found'}
+        store.remove(event_to_delete.id)
 
         return {
             'status': 'success',
@@ -332,48 +1045,31 @@ def delete_event(event_title):
         return {'status': 'error', 'message': f'Failed to delete event: {str(e)}'}
 
 
-def reschedule_event(event_title, new_time_input):
-    """Reschedule event by title to new time"""
+def reschedule_event(event_title, new_time_input, event_id=None):
+    """Reschedule event (by ID, or by title when no ID is given) to new time"""
     try:
         service = get_calendar_service()
         if not service:
             return {'status': 'error', 'message': 'Calendar authentication failed'}
 
-        # Search for events with matching title
-        events = get_upcoming_events(30)
-        event_to_reschedule = None
-
-        for event in events:
-            if event.get('summary', '').lower() == event_title.lower():
-                event_to_reschedule = event
-                break
+        store, event_to_reschedule = _resolve_event(event_title, event_id)
 
         if not event_to_reschedule:
             return {'status': 'error', 'message': f'Event "{event_title}" not found'}
+        event_title = event_title or event_to_reschedule.summary or event_to_reschedule.id
 
         # Parse new time - handle both natural language and formatted dates
-        new_time = None
-
-        # Try to parse as formatted date first
-        try:
-            new_time = datetime.strptime(new_time_input, "%Y-%m-%d %H:%M")
-        except ValueError:
-            try:
-                new_time = datetime.strptime(new_time_input, "%Y-%m-%d")
-                new_time = new_time.replace(hour=14, minute=0)  # 2 PM default
-            except ValueError:
-                parser = SmartTimeParser()
-                new_time = parser.extract_datetime(new_time_input)
+        new_time = _parse_new_time(new_time_input)
 
         print(f"DEBUG: Parsed new_time: {new_time}")
         print(f"DEBUG: Formatted date: {new_time.strftime('%b %d')}")
 
+        conflicts = find_conflicts(new_time, new_time + timedelta(hours=1), exclude_id=event_to_reschedule.id)
         new_start_time = new_time.isoformat()
         new_end_time = (new_time + timedelta(hours=1)).isoformat()
 
-        updated_event = {
-            'summary': event_to_reschedule['summary'],
-            'description': event_to_reschedule.get('description', ''),
+        # Only the times change, so PATCH them and leave everything else as is
+        time_change = {
             'start': {
                 'dateTime': new_start_time,
                 'timeZone': 'America/New_York',
@@ -384,15 +1080,12 @@ def reschedule_event(event_title, new_time_input):
             },
         }
 
-        for field in ['location', 'attendees', 'reminders']:
-            if field in event_to_reschedule:
-                updated_event[field] = event_to_reschedule[field]
-
-        service.events().update(
-            calendarId='primary',
-            eventId=event_to_reschedule['id'],
-            body=updated_event
+        rescheduled = service.events().patch(
+            calendarId=store.calendar_id,
+            eventId=event_to_reschedule.id,
+            body=time_change
         ).execute()
+        store.apply_local(rescheduled)
 
         display_date = new_time.strftime("%I:%M %p on %b %d")
         print(f"DEBUG: display_date: {display_date}")
@@ -402,36 +1095,77 @@ def reschedule_event(event_title, new_time_input):
             'old_title': event_title,
             'new_time': new_time.strftime("%Y-%m-%d %H:%M"),
             'display_time': display_date,
-            'message': f'Event "{event_title}" rescheduled to {display_date}'
+            'conflicts': [record.summary or 'No title' for record in conflicts],
+            'message': f'Event "{event_title}" rescheduled to {display_date}' + _conflict_note(conflicts)
         }
 
     except Exception as e:
         return {'status': 'error', 'message': f'Failed to reschedule event: {str(e)}'}
 
 
-def get_events_today():
-    """Get today's events"""
+def reschedule_event_series(event_title=None, new_time_input=None, event_id=None, recurrence_input=None):
+    """
+    Edit a whole recurring series with one PATCH on its master event:
+    move it to a new time and/or give it a new recurrence pattern.
+    `event_title`/`event_id` may name any instance of the series.
+    """
     try:
         service = get_calendar_service()
         if not service:
-            return []
+            return {'status': 'error', 'message': 'Calendar authentication failed'}
 
-        now = datetime.utcnow().isoformat() + 'Z'
-        end_of_day = (datetime.now() + timedelta(days=1)).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        end_of_day_utc = end_of_day.isoformat() + 'Z'
+        store, instance = _resolve_event(event_title, event_id)
+        if not instance:
+            return {'status': 'error', 'message': f'Event "{event_title}" not found'}
+        event_title = event_title or instance.summary or instance.id
+        series_id = instance.recurring_id or instance.id
 
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=now,
-            timeMax=end_of_day_utc,
-            maxResults=20,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
+        changes = {}
+        rrule = None
+        if recurrence_input:
+            rrule, pattern_type, details = parse_recurrence(recurrence_input)
+            if not rrule:
+                return {'status': 'error', 'message': f'Could not understand recurrence "{recurrence_input}"'}
+            changes['recurrence'] = [rrule]
 
-        return events_result.get('items', [])
+        new_time = None
+        if new_time_input:
+            new_time = _parse_new_time(new_time_input)
+            if rrule:
+                new_time = _first_occurrence(new_time, pattern_type, details)
+            changes['start'] = {'dateTime': new_time.isoformat(), 'timeZone': 'America/New_York'}
+            changes['end'] = {'dateTime': (new_time + timedelta(hours=1)).isoformat(), 'timeZone': 'America/New_York'}
+
+        if not changes:
+            return {'status': 'error', 'message': 'Nothing to change'}
+
+        service.events().patch(calendarId=store.calendar_id, eventId=series_id, body=changes).execute()
+        # Every instance may have moved; pull them with the next delta sync
+        store.last_sync = 0
+
+        parts = []
+        if new_time:
+            parts.append(f'to {new_time.strftime("%I:%M %p starting %b %d")}')
+        if rrule:
+            parts.append(f'repeating {rrule[len("RRULE:"):]}')
+        return {
+            'status': 'success',
+            'title': event_title,
+            'series_id': series_id,
+            'recurrence': rrule,
+            'new_time': new_time.strftime("%Y-%m-%d %H:%M") if new_time else None,
+            'message': f'Series "{event_title}" updated ' + ' and '.join(parts)
+        }
+
+    except Exception as e:
+        return {'status': 'error', 'message': f'Failed to update event series: {str(e)}'}
+
+
+def get_events_today():
+    """Get today's events"""
+    try:
+        now = datetime.now()
+        return [record.to_dict() for record in iter_events(now, _day_start(now) + timedelta(days=1))]
 
     except Exception as e:
         print(f"Error getting today's events: {e}")
@@ -441,28 +1175,8 @@ def get_events_today():
 def get_events_tomorrow():
     """Get tomorrow's events"""
     try:
-        service = get_calendar_service()
-        if not service:
-            return []
-
-        tomorrow = datetime.now() + timedelta(days=1)
-        start_time = tomorrow.replace(
-            hour=0, minute=0, second=0, microsecond=0
-        ).isoformat() + 'Z'
-        end_time = (tomorrow + timedelta(days=1)).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        ).isoformat() + 'Z'
-
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=start_time,
-            timeMax=end_time,
-            maxResults=20,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-
-        return events_result.get('items', [])
+        start_time = _day_start(datetime.now()) + timedelta(days=1)
+        return [record.to_dict() for record in iter_events(start_time, start_time + timedelta(days=1))]
 
     except Exception as e:
         print(f"Error getting tomorrow's events: {e}")
@@ -472,383 +1186,325 @@ def get_events_tomorrow():
 def get_upcoming_events(days=7):
     """Get upcoming events for specified days"""
     try:
-        service = get_calendar_service()
-        if not service:
-            return []
-
-        now = datetime.utcnow().isoformat() + 'Z'
-        end_time = (datetime.now() + timedelta(days=days)).isoformat() + 'Z'
-
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=now,
-            timeMax=end_time,
-            maxResults=30,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-
-        return events_result.get('items', [])
+        now = datetime.now()
+        return [record.to_dict() for record in iter_events(now, now + timedelta(days=days))]
 
     except Exception as e:
         print(f"Error getting upcoming events: {e}")
         return []
 
 
+def _matches_query(record, query):
+    # Same fields the API's free-text search covers
+    return query in record.summary.lower() or query in record.search_text
+
+
 def search_events(query):
     """Search events by title"""
     try:
-        service = get_calendar_service()
-        if not service:
-            return []
+        query = query.lower()
+        return [record.to_dict() for record in iter_events(datetime.now()) if _matches_query(record, query)]
 
-        now = datetime.utcnow().isoformat() + 'Z'
+    except Exception as e:
+        print(f"Error searching events: {e}")
+        return []
 
-        events_result = service.events().list(
-            calendarId='primary',
-            q=query,
-            timeMin=now,
-            maxResults=20,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
 
-        return events_result.get('items', [])
+# ---------------------------------------------------------------------------
+# Free-slot finder
+# ---------------------------------------------------------------------------
+
+WORKING_HOURS = (9, 18)
+# Windows for parts of the day, each starting at the hour SmartTimeParser
+# gives that word ("afternoon" = 14:00) and running to the next one
+DAY_PARTS = {
+    'morning': (9, 12),
+    'afternoon': (14, 18),
+    'evening': (18, 20),
+    'night': (20, 23),
+    'tonight': (20, 23),
+}
+SLOT_STEP = timedelta(minutes=15)
+DEFAULT_SLOT_MINUTES = 30
+
+
+def _parse_duration(text):
+    """Requested meeting length in minutes ("30 minutes", "1.5 hours", "an hour")"""
+    match = re.search(r'(\d+(?:\.\d+)?)\s*(minutes?|mins?|hours?|hrs?|h)\b', text)
+    if match:
+        amount = float(match.group(1))
+        return int(amount * 60) if match.group(2).startswith('h') else int(amount)
+    if 'half an hour' in text or 'half hour' in text:
+        return 30
+    if re.search(r'\ban hour\b', text):
+        return 60
+    return DEFAULT_SLOT_MINUTES
+
+
+def _search_window(text, now):
+    """(start, end) to search: the requested day, narrowed to a part of day or working hours"""
+    day = SmartTimeParser()._extract_date(text, now)
+    start_hour, end_hour = WORKING_HOURS
+    for word, hours in DAY_PARTS.items():
+        if re.search(rf'\b{word}\b', text):
+            start_hour, end_hour = hours
+            break
+    day_start = datetime.combine(day, datetime.min.time())
+    return day_start.replace(hour=start_hour), day_start.replace(hour=end_hour)
+
+
+def _busy_from_freebusy(service, window_start, window_end):
+    result = service.freebusy().query(body={
+        'timeMin': window_start.astimezone().isoformat(),
+        'timeMax': window_end.astimezone().isoformat(),
+        'items': [{'id': calendar_id} for calendar_id in list_calendars(service)],
+    }).execute()
+    return [
+        (_event_timestamp({'dateTime': busy['start']}), _event_timestamp({'dateTime': busy['end']}))
+        for calendar in result.get('calendars', {}).values()
+        for busy in calendar.get('busy', [])
+    ]
+
+
+def _busy_from_store(window_start, window_end):
+    return [
+        (start, end)
+        for start, end, record in _local_timeline().iter_spans(window_start.timestamp(), window_end.timestamp())
+        if not record.all_day and not record.transparent
+    ]
+
+
+def _merge_intervals(intervals):
+    """Sweep sorted (start, end) pairs into disjoint busy blocks"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def find_free_slots(request_text='', duration_minutes=None, k=3, use_api=True):
+    """
+    Top-k earliest free slots for a request like "30 minutes tomorrow
+    afternoon". Busy time comes from one freebusy().query() call, or from
+    the local event store if that call fails or use_api is False.
+    Slots start on 15-minute boundaries, never in the past, and do not
+    overlap each other.
+    """
+    try:
+        text = request_text.lower()
+        duration = timedelta(minutes=duration_minutes or _parse_duration(text))
+        now = datetime.now()
+        window_start, window_end = _search_window(text, now)
+
+        busy = None
+        if use_api:
+            service = get_calendar_service()
+            if service:
+                try:
+                    busy = _busy_from_freebusy(service, window_start, window_end)
+                except Exception as e:
+                    print(f"Free/busy query failed, using cached events: {e}")
+        if busy is None:
+            busy = _busy_from_store(window_start, window_end)
+
+        # Round "now" up to the slot grid so offers are never in the past
+        earliest = now + (datetime.min - now) % SLOT_STEP
+        cursor = max(window_start, earliest).timestamp()
+        limit = window_end.timestamp()
+        step = SLOT_STEP.total_seconds()
+        length = duration.total_seconds()
+        # Slots after the first stay on the grid: a 20-minute slot uses up 30 minutes
+        advance = -(-length // step) * step
+
+        slots = []
+        for block_start, block_end in _merge_intervals(busy) + [[limit, limit]]:
+            while len(slots) < k and cursor + length <= min(block_start, limit):
+                slots.append((cursor, cursor + length))
+                cursor += advance
+            if len(slots) >= k or block_start >= limit:
+                break
+            if block_end > cursor:
+                # next grid point at or after the end of this busy block
+                cursor = window_start.timestamp() + -(-(block_end - window_start.timestamp()) // step) * step
+
+        formatted = []
+        for start, end in slots:
+            start_dt, end_dt = datetime.fromtimestamp(start), datetime.fromtimestamp(end)
+            formatted.append({
+                'start': start_dt.strftime('%Y-%m-%d %H:%M'),
+                'end': end_dt.strftime('%Y-%m-%d %H:%M'),
+                'display': f"{start_dt.strftime('%I:%M %p')} - {end_dt.strftime('%I:%M %p')} on {start_dt.strftime('%b %d')}",
+            })
+        return formatted
 
     except Exception as e:
-        print(f"Error searching events: {e}")
+        print(f"Error finding free slots: {e}")
         return []
 
 
-def get_calendar_statistics():
-    """Get calendar statistics"""
+def _day_label(day, today):
+    offset = (day.date() - today.date()).days
+    if offset == 0:
+        return 'Today'
+    if offset == 1:
+        return 'Tomorrow'
+    return day.strftime('%A, %b %d')
+
+
+def get_calendar_statistics(days=7):
+    """
+    Get calendar statistics for the next `days` days from a single read of
+    the event store: counts for today/tomorrow/the week plus a per-day
+    histogram of event counts and busy minutes (overlaps counted once,
+    all-day events count as events but not as busy time).
+    """
     try:
-        today = get_events_today()
-        tomorrow = get_events_tomorrow()
-        upcoming = get_upcoming_events(7)
+        timeline = sync_events()
+        if not timeline:
+            raise RuntimeError('Calendar authentication failed')
+
+        now = datetime.now()
+        today = _day_start(now)
+        boundaries = [(today + timedelta(days=i)).timestamp() for i in range(days + 1)]
+        week_end = (now + timedelta(days=days)).timestamp()
+        now_ts = now.timestamp()
+
+        counts = [0] * days
+        busy = [0.0] * days
+        open_spans = [None] * days   # current merged (start, end) per day
+        events_today = upcoming_week = 0
+
+        for start, end, record in timeline.iter_spans(boundaries[0], max(week_end, boundaries[-1])):
+            if end > now_ts and start < week_end:
+                upcoming_week += 1
+                if days and start < boundaries[1]:
+                    events_today += 1
+            all_day = record.all_day
+            first = max(bisect.bisect_right(boundaries, start) - 1, 0)
+            for i in range(first, days):
+                day_start, day_end = boundaries[i], boundaries[i + 1]
+                if start >= day_end:
+                    continue
+                if end <= day_start:
+                    break
+                counts[i] += 1
+                if all_day:
+                    continue
+                lo, hi = max(start, day_start), min(end, day_end)
+                current = open_spans[i]
+                if current and lo <= current[1]:
+                    open_spans[i] = (current[0], max(current[1], hi))
+                else:
+                    if current:
+                        busy[i] += current[1] - current[0]
+                    open_spans[i] = (lo, hi)
+
+        histogram = []
+        for i in range(days):
+            if open_spans[i]:
+                busy[i] += open_spans[i][1] - open_spans[i][0]
+            day = today + timedelta(days=i)
+            histogram.append({
+                'date': day.strftime('%Y-%m-%d'),
+                'label': _day_label(day, now),
+                'events': counts[i],
+                'busy_minutes': int(round(busy[i] / 60)),
+            })
+
+        busiest = max(histogram, key=lambda d: (d['events'], d['busy_minutes'])) if histogram else None
 
         return {
-            'events_today': len(today),
-            'events_tomorrow': len(tomorrow),
-            'upcoming_week': len(upcoming),
-            'busiest_day': 'Today' if len(today) >= len(tomorrow) else 'Tomorrow'
+            'events_today': events_today,
+            'events_tomorrow': counts[1] if days > 1 else 0,
+            'upcoming_week': upcoming_week,
+            'busiest_day': busiest['label'] if busiest and busiest['events'] else 'Today',
+            'daily': histogram,
         }
 
     except Exception as e:
         print(f"Error getting calendar statistics: {e}")
-        return {'events_today': 0, 'events_tomorrow': 0, 'upcoming_week': 0, 'busiest_day': 'Today'}
+        return {'events_today': 0, 'events_tomorrow': 0, 'upcoming_week': 0, 'busiest_day': 'Today', 'daily': []}
 
 
-def get_formatted_events_today():
-    """Get formatted today's events for display"""
-    events = get_events_today()
+def _format_events(records, limit=None):
+    """Display rows for EventRecords, consuming at most `limit` of them"""
     formatted = []
 
-    for event in events:
-        start = event['start'].get('dateTime', event['start'].get('date'))
-        if 'T' in start:
-            event_time = datetime.fromisoformat(start.replace('Z', '+00:00'))
-            time_str = event_time.strftime('%I:%M %p')
-        else:
-            time_str = "All day"
-            event_time = datetime.fromisoformat(start)
-
-        formatted.append({
-            'title': event.get('summary', 'No title'),
-            'time': time_str,
-            'date': datetime.now().strftime('%b %d, %Y')
-        })
+    try:
+        for record in itertools.islice(records, limit):
+            event_time = record.start_datetime
+            time_str = "All day" if record.all_day else event_time.strftime('%I:%M %p')
+
+            formatted.append({
+                'title': record.summary or 'No title',
+                'time': time_str,
+                'date': event_time.strftime('%b %d, %Y'),
+                'id': record.id,
+                'meet_link': record.meet_link,
+            })
+    except Exception as e:
+        print(f"Error getting events: {e}")
 
     return formatted
 
 
-def get_formatted_events_tomorrow():
-    """Get formatted tomorrow's events for display"""
-    events = get_events_tomorrow()
-    formatted = []
-    tomorrow = (datetime.now() + timedelta(days=1)).strftime('%b %d, %Y')
+def get_formatted_events_today(limit=None):
+    """Get formatted today's events for display"""
+    now = datetime.now()
+    return _format_events(iter_events(now, _day_start(now) + timedelta(days=1)), limit)
 
-    for event in events:
-        start = event['start'].get('dateTime', event['start'].get('date'))
-        if 'T' in start:
-            event_time = datetime.fromisoformat(start.replace('Z', '+00:00'))
-            time_str = event_time.strftime('%I:%M %p')
-        else:
-            time_str = "All day"
 
-        formatted.append({
-            'title': event.get('summary', 'No title'),
-            'time': time_str,
-            'date': tomorrow
-        })
+def get_formatted_events_tomorrow(limit=None):
+    """Get formatted tomorrow's events for display"""
+    start_time = _day_start(datetime.now()) + timedelta(days=1)
+    return _format_events(iter_events(start_time, start_time + timedelta(days=1)), limit)
 
-    return formatted
+
+EVENT_PARSE_POLICY = ParsePolicy(weekday_today=True, roll_year=False)
 
 
 def parse_datetime_for_event(text: str):
     """
     Parse natural language expressions into (YYYY-MM-DD, HH:MM) for events.
-    More sophisticated than task parser, handles more expressions.
+    A bare weekday may mean today and dates keep the year they fall in.
     """
     if not isinstance(text, str):
         return None, None
 
-    t = text.lower().strip()
     now = datetime.now()
 
     # Default time for events is 2 PM (14:00) - common meeting time
     default_hour, default_minute = 14, 0
 
-    # ===== 1. Handle absolute dates with different formats =====
-
-    date_patterns = [
-        r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(\d{1,2})(?:\s*,\s*(\d{4}))?',
-        r'(\d{1,2})\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*(?:\s*,\s*(\d{4}))?',
-        r'(\d{1,2})[/-](\d{1,2})(?:[/-](\d{2,4}))?',
-        r'(\d{4})[-/](\d{1,2})[-/](\d{1,2})'
-    ]
-
-    months = {
-        'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3,
-        'apr': 4, 'april': 4, 'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
-        'aug': 8, 'august': 8, 'sep': 9, 'september': 9, 'oct': 10, 'october': 10,
-        'nov': 11, 'november': 11, 'dec': 12, 'december': 12
-    }
-
-    for pattern in date_patterns:
-        match = re.search(pattern, t, re.IGNORECASE)
-        if match:
-            try:
-                groups = match.groups()
-                if pattern.startswith('(jan|feb'):  # Month Day pattern
-                    month_str = groups[0].lower()[:3]
-                    day = int(groups[1])
-                    year = int(groups[2]) if groups[2] else now.year
-                    month = months.get(month_str)
-                elif pattern.startswith('(\\d{1,2})\\s+(jan'):  # Day Month pattern
-                    day = int(groups[0])
-                    month_str = groups[1].lower()[:3]
-                    year = int(groups[2]) if groups[2] else now.year
-                    month = months.get(month_str)
-                elif pattern.startswith('(\\d{1,2})[/-]'):  # DD/MM or MM/DD
-                    if len(groups) == 3:
-                        num1, num2, year_part = groups
-                        num1, num2 = int(num1), int(num2)
-                        if num1 > 12:
-                            day, month = num1, num2
-                        else:
-                            month, day = num1, num2
-                        year = int(year_part) if year_part else now.year
-                        if year < 100:
-                            year += 2000 if year < 50 else 1900
-                elif pattern.startswith('(\\d{4})'):  # YYYY-MM-DD
-                    year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
-
-                event_date = datetime(year, month, day)
-
-                hour, minute = default_hour, default_minute
-                time_match = re.search(r'(\d{1,2})(?::(\d{2}))?\s*(am|pm)?', t, re.IGNORECASE)
-                if time_match:
-                    hour = int(time_match.group(1))
-                    minute = int(time_match.group(2)) if time_match.group(2) else 0
-                    period = time_match.group(3).lower() if time_match.group(3) else ''
-
-                    if period == 'pm' and hour < 12:
-                        hour += 12
-                    elif period == 'am' and hour == 12:
-                        hour = 0
-
-                event_datetime = event_date.replace(hour=hour, minute=minute)
-                return (
-                    event_datetime.strftime("%Y-%m-%d"),
-                    event_datetime.strftime("%H:%M")
-                )
-
-            except (ValueError, TypeError):
-                continue
-
-    # ===== 2. Handle relative dates =====
-
-    if "today" in t:
-        dt_ = now.replace(hour=default_hour, minute=default_minute)
-        return dt_.strftime("%Y-%m-%d"), dt_.strftime("%H:%M")
-
-    if "tomorrow" in t and "day after" not in t:
-        dt_ = now + timedelta(days=1)
-        dt_ = dt_.replace(hour=default_hour, minute=default_minute)
-        return dt_.strftime("%Y-%m-%d"), dt_.strftime("%H:%M")
-
-    if "day after tomorrow" in t:
-        dt_ = now + timedelta(days=2)
-        dt_ = dt_.replace(hour=default_hour, minute=default_minute)
-        return dt_.strftime("%Y-%m-%d"), dt_.strftime("%H:%M")
-
-    if "yesterday" in t:
-        dt_ = now - timedelta(days=1)
-        dt_ = dt_.replace(hour=default_hour, minute=default_minute)
-        return dt_.strftime("%Y-%m-%d"), dt_.strftime("%H:%M")
-
-    if "next week" in t:
-        dt_ = now + timedelta(days=7)
-        dt_ = dt_.replace(hour=default_hour, minute=default_minute)
-        return dt_.strftime("%Y-%m-%d"), dt_.strftime("%H:%M")
-
-    if "next month" in t:
-        dt_ = now + timedelta(days=30)
-        dt_ = dt_.replace(hour=default_hour, minute=default_minute)
-        return dt_.strftime("%Y-%m-%d"), dt_.strftime("%H:%M")
-
-    # ===== 3. Handle weekdays =====
-
-    weekdays = {
-        'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
-        'friday': 4, 'saturday': 5, 'sunday': 6,
-        'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6
-    }
-
-    weekday_match = re.search(
-        r'\b(this|next|coming)?\s*(monday|tuesday|wednesday|thursday|friday|saturday|sunday|mon|tue|wed|thu|fri|sat|sun)\b',
-        t,
-        re.IGNORECASE
+    event_datetime = match_phrase(text, now, EVENT_PARSE_POLICY)
+    if event_datetime is not None:
+        return event_datetime.strftime("%Y-%m-%d"), event_datetime.strftime("%H:%M")
+
+    # Nothing the shared grammar knows; try dateparser as fallback
+    parsed = fallback_parse(
+        text,
+        settings={
+            'PREFER_DATES_FROM': 'future',
+            'RELATIVE_BASE': now,
+            'PREFER_DAY_OF_MONTH': 'first'
+        }
     )
+    if parsed:
+        if parsed.hour == 0 and parsed.minute == 0:
+            parsed = parsed.replace(hour=default_hour, minute=default_minute)
+        return parsed.strftime("%Y-%m-%d"), parsed.strftime("%H:%M")
 
-    if weekday_match:
-        prefix = weekday_match.group(1) or ''
-        day_name = weekday_match.group(2).lower()
-
-        if day_name in weekdays:
-            target_weekday = weekdays[day_name]
-            current_weekday = now.weekday()
-            days_ahead = target_weekday - current_weekday
-
-            if prefix.lower() in ['next', 'coming']:
-                if days_ahead <= 0:
-                    days_ahead += 7
-                days_ahead += 7
-            else:
-                if days_ahead < 0:
-                    days_ahead += 7
-
-            event_date = now + timedelta(days=days_ahead)
-
-            hour, minute = default_hour, default_minute
-            time_match = re.search(r'(\d{1,2})(?::(\d{2}))?\s*(am|pm)?', t, re.IGNORECASE)
-            if time_match:
-                hour = int(time_match.group(1))
-                minute = int(time_match.group(2)) if time_match.group(2) else 0
-                period = time_match.group(3).lower() if time_match.group(3) else ''
-
-                if period == 'pm' and hour < 12:
-                    hour += 12
-                elif period == 'am' and hour == 12:
-                    hour = 0
-
-            event_datetime = event_date.replace(hour=hour, minute=minute)
-            return (
-                event_datetime.strftime("%Y-%m-%d"),
-                event_datetime.strftime("%H:%M")
-            )
-
-    # ===== 4. Time-of-day expressions =====
-
-    time_expressions = {
-        'morning': (9, 0),
-        'afternoon': (14, 0),
-        'evening': (18, 0),
-        'night': (20, 0),
-        'tonight': (20, 0),
-        'noon': (12, 0),
-        'midnight': (0, 0),
-        'lunch': (12, 30),
-        'dinner': (19, 0),
-        'breakfast': (8, 0),
-    }
-
-    for expr, (hour, minute) in time_expressions.items():
-        if expr in t:
-            date_found = False
-
-            for pattern in date_patterns[:2]:
-                match = re.search(pattern, t, re.IGNORECASE)
-                if match:
-                    try:
-                        groups = match.groups()
-                        if pattern.startswith('(jan|feb'):
-                            month_str = groups[0].lower()[:3]
-                            day = int(groups[1])
-                            year = int(groups[2]) if groups[2] else now.year
-                            month = months.get(month_str)
-                        else:
-                            day = int(groups[0])
-                            month_str = groups[1].lower()[:3]
-                            year = int(groups[2]) if groups[2] else now.year
-                            month = months.get(month_str)
-
-                        event_date = datetime(year, month, day)
-                        event_datetime = event_date.replace(hour=hour, minute=minute)
-                        return (
-                            event_datetime.strftime("%Y-%m-%d"),
-                            event_datetime.strftime("%H:%M")
-                        )
-                    except Exception:
-                        continue
-
-            if hour < 12:
-                dt_ = now.replace(hour=hour, minute=minute)
-                if dt_ < now:
-                    dt_ += timedelta(days=1)
-            else:
-                dt_ = now.replace(hour=hour, minute=minute)
-                if dt_ < now:
-                    dt_ += timedelta(days=1)
-
-            return dt_.strftime("%Y-%m-%d"), dt_.strftime("%H:%M")
-
-    # ===== 5. Try dateparser as fallback =====
-
-    try:
-        import dateparser
-        parsed = dateparser.parse(
-            t,
-            settings={
-                'PREFER_DATES_FROM': 'future',
-                'RELATIVE_BASE': now,
-                'PREFER_DAY_OF_MONTH': 'first'
-            }
-        )
-        if parsed:
-            if parsed.hour == 0 and parsed.minute == 0:
-                parsed = parsed.replace(hour=default_hour, minute=default_minute)
-            return parsed.strftime("%Y-%m-%d"), parsed.strftime("%H:%M")
-    except ImportError:
-        pass
-
-    # ===== 6. Ultimate fallback =====
+    # Ultimate fallback
     fallback = now + timedelta(days=1)
     fallback = fallback.replace(hour=default_hour, minute=default_minute)
     return fallback.strftime("%Y-%m-%d"), fallback.strftime("%H:%M")
 
 
-def get_formatted_upcoming_events(days=7):
+def get_formatted_upcoming_events(days=7, limit=None):
     """Get formatted upcoming events for display"""
-    events = get_upcoming_events(days)
-    formatted = []
-
-    for event in events:
-        start = event['start'].get('dateTime', event['start'].get('date'))
-        if 'T' in start:
-            event_time = datetime.fromisoformat(start.replace('Z', '+00:00'))
-            time_str = event_time.strftime('%I:%M %p')
-            date_str = event_time.strftime('%b %d, %Y')
-        else:
-            time_str = "All day"
-            event_date = datetime.fromisoformat(start)
-            date_str = event_date.strftime('%b %d, %Y')
-
-        formatted.append({
-            'title': event.get('summary', 'No title'),
-            'time': time_str,
-            'date': date_str
-        })
-
-    return formatted
+    now = datetime.now()
+    return _format_events(iter_events(now, now + timedelta(days=days)), limit)
@@ -1,21 +1,45 @@
 import os
 import pickle
 import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-import dateparser
 
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 
+from time_parser import (
+    CONFIDENCE_DEFAULT, VAGUE_TIMES, ParsePolicy, fallback_parse, grammar_stats,
+    match as match_phrase, parse_cache_stats, parse_many,
+)
+
 SCOPES = ["https://www.googleapis.com/auth/tasks"]
 CRED_FOLDER = "google_credentials"
 CLIENT_SECRET_FILE = os.path.join(CRED_FOLDER, "credentials.json")
 TOKEN_FILE = os.path.join(CRED_FOLDER, "token.pickle")
+TASKS_CACHE_DB = os.path.join(CRED_FOLDER, "tasks_cache.db")
 
 os.makedirs(CRED_FOLDER, exist_ok=True)
 
-def get_tasks_service():
+# -----------------------------
+# Service registry: one authorized client per process
+# -----------------------------
+_service_lock = threading.Lock()
+_service = None
+_creds = None
+
+
+def _save_credentials(creds):
+    with open(TOKEN_FILE, "wb") as token:
+        pickle.dump(creds, token)
+
+
+def _load_credentials():
     creds = None
     if os.path.exists(TOKEN_FILE):
         try:
@@ -37,10 +61,45 @@ def get_tasks_service():
             flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRET_FILE, SCOPES)
             creds = flow.run_local_server(port=0)
 
-        with open(TOKEN_FILE, "wb") as token:
-            pickle.dump(creds, token)
+        _save_credentials(creds)
 
-    return build("tasks", "v1", credentials=creds)
+    return creds
+
+
+def get_tasks_service():
+    """
+    Return the process-wide Tasks client, building it on first use.
+    Expired credentials are refreshed in place, so the client (which holds a
+    reference to the same credentials object) stays authorized. If the
+    refresh fails (e.g. a revoked token), credentials are reloaded, which
+    falls back to the OAuth flow, and the client is rebuilt.
+    """
+    global _service, _creds
+    with _service_lock:
+        if _service is None:
+            _creds = _load_credentials()
+            _service = build("tasks", "v1", credentials=_creds, cache_discovery=False)
+        elif not getattr(_creds, "valid", False):
+            refreshed = False
+            if getattr(_creds, "refresh_token", None):
+                try:
+                    _creds.refresh(Request())
+                    _save_credentials(_creds)
+                    refreshed = True
+                except Exception as e:
+                    print(f"Refreshing Tasks credentials failed, re-authorizing: {e}")
+            if not refreshed:
+                _creds = _load_credentials()
+                _service = build("tasks", "v1", credentials=_creds, cache_discovery=False)
+        return _service
+
+
+def reset_tasks_service():
+    """Drop the cached client so the next call re-reads the token file."""
+    global _service, _creds
+    with _service_lock:
+        _service = None
+        _creds = None
 
 
 def to_rfc3339(dt: datetime) -> str:
@@ -50,113 +109,30 @@ def to_rfc3339(dt: datetime) -> str:
     return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-WEEKDAYS = {
-    "monday": 0, "mon": 0,
-    "tuesday": 1, "tue": 1, "tues": 1,
-    "wednesday": 2, "wed": 2,
-    "thursday": 3, "thu": 3, "thurs": 3,
-    "friday": 4, "fri": 4,
-    "saturday": 5, "sat": 5,
-    "sunday": 6, "sun": 6
-}
+# Tasks default to the start of the working day, and "afternoon" to mid-afternoon
+TASK_DEFAULT_TIME = (9, 0)
+TASK_VAGUE_TIMES = {**VAGUE_TIMES, "afternoon": (15, 0)}
+TASK_PARSE_POLICY = ParsePolicy(default_time=TASK_DEFAULT_TIME, vague_times=TASK_VAGUE_TIMES,
+                                next_skips_week=False)
 
-def next_weekday_option_b(target_wd: int) -> datetime:
-    today = datetime.now().date()
-    today_wd = today.weekday()
-    days_ahead = (target_wd - today_wd) % 7
-    if days_ahead == 0:
-        days_ahead = 7
-    target_date = today + timedelta(days=days_ahead)
-    return datetime.combine(target_date, datetime.min.time())
 
 def parse_datetime_from_text(text: str):
     """
     Parse many natural expressions into (YYYY-MM-DD, HH:MM).
     Returns (date_str, time_str) or (fallback_date, fallback_time).
+    A weekday always means the coming one, "next" or not. dateparser only
+    runs, and is only imported, for phrases the shared grammar misses.
     """
     if not isinstance(text, str):
         return None, None
 
-    t = text.lower().strip()
     now = datetime.now()
-    default_hour, default_minute = 9, 0
-
-    if "today" in t:
-        dt = now.replace(hour=default_hour, minute=default_minute, second=0, microsecond=0)
-        return dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M")
-    if "tomorrow" in t and "day after" not in t:
-        dt = now + timedelta(days=1)
-        dt = dt.replace(hour=default_hour, minute=default_minute, second=0, microsecond=0)
+    dt = match_phrase(text, now, TASK_PARSE_POLICY)
+    if dt is not None:
         return dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M")
-    if "day after tomorrow" in t:
-        dt = now + timedelta(days=2)
-        dt = dt.replace(hour=default_hour, minute=default_minute, second=0, microsecond=0)
-        return dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M")
-    if "yesterday" in t:
-        dt = now - timedelta(days=1)
-        dt = dt.replace(hour=default_hour, minute=default_minute, second=0, microsecond=0)
-        return dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M")
-
-    vague = {
-        "morning": "09:00",
-        "afternoon": "15:00",
-        "evening": "18:00",
-        "tonight": "20:00",
-        "night": "20:00",
-        "noon": "12:00"
-    }
-    t_for_parse = t
-    for w, rep in vague.items():
-        t_for_parse = re.sub(rf"\b{w}\b", rep, t_for_parse)
-
-    date_match = re.search(
-        r"\bon\s+(\d{1,2}\s*[A-Za-z]+|\d{1,2}[/-]\d{1,2}([/-]\d{2,4})?|[A-Za-z]+\s*\d{1,2})",
-        t,
-        flags=re.IGNORECASE,
-    )
-    if date_match:
-        raw = date_match.group(1)
-        parsed = dateparser.parse(raw, settings={"PREFER_DATES_FROM": "future"})
-        if parsed:
-            tm = re.search(r"\b(at\s*)?(\d{1,2}(:\d{2})?\s*(am|pm)?)\b", t)
-            if tm:
-                p2 = dateparser.parse(tm.group(2))
-                if p2:
-                    parsed = parsed.replace(hour=p2.hour, minute=p2.minute)
-            else:
-                parsed = parsed.replace(hour=default_hour, minute=default_minute)
-            return parsed.strftime("%Y-%m-%d"), parsed.strftime("%H:%M")
-
-    wd_match = re.search(
-        r"\b(this|next|coming)?\s*(monday|tuesday|wednesday|thursday|friday|saturday|sunday|mon|tue|wed|thu|fri|sat|sun)\b",
-        t,
-        flags=re.IGNORECASE,
-    )
-    if wd_match:
-        wd = wd_match.group(2).lower()
-        if wd in WEEKDAYS:
-            final_dt = next_weekday_option_b(WEEKDAYS[wd])
-            tm = re.search(r"\b(at\s*)?(\d{1,2}(:\d{2})?\s*(am|pm)?)\b", t)
-            if tm:
-                p2 = dateparser.parse(tm.group(2))
-                if p2:
-                    final_dt = final_dt.replace(hour=p2.hour, minute=p2.minute)
-            else:
-                final_dt = final_dt.replace(hour=default_hour, minute=default_minute)
-            return final_dt.strftime("%Y-%m-%d"), final_dt.strftime("%H:%M")
 
-    hh = re.search(r"\bin\s+(\d+)\s+hours?\b", t)
-    if hh:
-        dt = now + timedelta(hours=int(hh.group(1)))
-        return dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M")
-    mm = re.search(r"\bin\s+(\d+)\s+minutes?\b", t)
-    if mm:
-        dt = now + timedelta(minutes=int(mm.group(1)))
-        return dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M")
-
-    dt = dateparser.parse(
-        t_for_parse, settings={"PREFER_DATES_FROM": "future", "RELATIVE_BASE": now}
-    )
+    default_hour, default_minute = TASK_DEFAULT_TIME
+    dt = fallback_parse(text, settings={"PREFER_DATES_FROM": "future", "RELATIVE_BASE": now})
     if dt:
         if dt.hour == 0 and dt.minute == 0:
             dt = dt.replace(hour=default_hour, minute=default_minute)
@@ -166,6 +142,33 @@ def parse_datetime_from_text(text: str):
     return fallback.strftime("%Y-%m-%d"), fallback.strftime("%H:%M")
 
 
+def parse_datetimes_from_texts(texts, now: datetime = None):
+    """
+    Bulk parse_datetime_from_text: one (date_str, time_str) per input, in
+    order, with every distinct phrase parsed once by parse_many().
+    """
+    now = now or datetime.now()
+    timestamps, confidence = parse_many(texts, now, TASK_PARSE_POLICY, fallback=True)
+    default_hour, default_minute = TASK_DEFAULT_TIME
+    undated = now.replace(hour=default_hour, minute=default_minute)
+    pairs = []
+    for stamp, flag in zip(timestamps, confidence):
+        # Same fallback as the single-phrase parser: today, not rolled forward
+        dt = undated if flag == CONFIDENCE_DEFAULT else datetime.fromtimestamp(stamp)
+        pairs.append((dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M")))
+    return pairs
+
+
+def get_datetime_parse_stats(top: int = 10):
+    """
+    How often the fast-path grammar missed and dateparser had to run, the
+    most common missed phrases, and the parse cache counters.
+    """
+    stats = grammar_stats(top)
+    stats["cache"] = parse_cache_stats()
+    return stats
+
+
 def extract_list_name_from_text(text: str) -> str:
     m = re.search(r"\b(under|in|into|to)\s+([A-Za-z0-9\s&_-]+)", text, flags=re.IGNORECASE)
     if not m:
@@ -199,27 +202,15 @@ def extract_task_title_from_natural_language(text: str) -> str:
     return " ".join(word.capitalize() for word in t.split())
 
 
-def create_task(user_input: str):
+def _parse_task_input(user_input: str, due=None):
     """
-    user_input: natural sentence. returns dict with status,title,date,time,list
+    Return (title, date_str, time_str, list_name, insert_body) for one sentence.
+    `due` is an already parsed (date_str, time_str) pair, as bulk imports pass.
     """
-    date_str, time_str = parse_datetime_from_text(user_input)
+    date_str, time_str = due or parse_datetime_from_text(user_input)
     title = extract_task_title_from_natural_language(user_input)
     list_name = extract_list_name_from_text(user_input)
 
-    service = get_tasks_service()
-
-    lists = service.tasklists().list().execute().get("items", [])
-    list_id = None
-    for lst in lists:
-        if lst["title"].strip().lower() == list_name.strip().lower():
-            list_id = lst["id"]
-            break
-
-    if not list_id:
-        created = service.tasklists().insert(body={"title": list_name}).execute()
-        list_id = created["id"]
-
     task_body = {"title": title}
     if date_str:
         try:
@@ -228,49 +219,531 @@ def create_task(user_input: str):
             task_body["due"] = to_rfc3339(dt)
         except Exception:
             task_body["due"] = f"{date_str}T{time_str}:00.000Z" if time_str else f"{date_str}T09:00:00.000Z"
+    return title, date_str, time_str, list_name, task_body
+
+
+def create_task(user_input: str):
+    """
+    user_input: natural sentence. returns dict with status,title,date,time,list
+    """
+    title, date_str, time_str, list_name, task_body = _parse_task_input(user_input)
+
+    service = get_tasks_service()
+    list_id = _resolve_task_list(list_name, create=True)
 
-    created_task = service.tasks().insert(tasklist=list_id, body=task_body).execute()
+    try:
+        created_task = service.tasks().insert(tasklist=list_id, body=task_body).execute()
+    except HttpError as e:
+        if e.resp.status != 404:
+            raise
+        # list was deleted elsewhere; re-resolve (and re-create) it once
+        _list_directory.remove(list_id)
+        list_id = _resolve_task_list(list_name, create=True)
+        created_task = service.tasks().insert(tasklist=list_id, body=task_body).execute()
+    _title_index.add(title, created_task.get("id"), list_id)
+    _task_store.apply_local(list_id, created_task)
     return {"status": "success", "title": title, "date": date_str, "time": time_str, "list": list_name, "id": created_task.get("id")}
 
 def get_task_lists():
-    service = get_tasks_service()
-    return service.tasklists().list().execute().get("items", [])
+    lists = list(iter_task_lists())
+    _list_directory.replace(lists)
+    return lists
+
+
+# -----------------------------
+# Paginated, field-masked readers
+# -----------------------------
+PAGE_SIZE = 100
+TASKLIST_FIELDS = "nextPageToken,items(id,title)"
+TASK_FIELDS = "nextPageToken,items(id,etag,title,due,status,updated,deleted,hidden)"
 
 
+def _iter_pages(list_method, **params):
+    """Yield items from a Google list() method, following nextPageToken."""
+    params.setdefault("maxResults", PAGE_SIZE)
+    while True:
+        response = list_method(**params).execute()
+        for item in response.get("items", []):
+            yield item
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return
+        params["pageToken"] = page_token
 
-def get_all_tasks():
+
+def _task_record(task, tlist):
+    return {
+        "id": task.get("id"),
+        "title": task.get("title"),
+        "due": task.get("due"),
+        "status": task.get("status"),
+        "list": tlist.get("title"),
+        "list_id": tlist.get("id"),
+    }
+
+
+# -----------------------------
+# Title index: normalized title -> (task_id, list_id)
+# -----------------------------
+def _normalize_title(title):
+    return (title or "").strip().lower()
+
+
+class _TaskTitleIndex:
+    """
+    In-memory lookup from normalized title to the first matching task, in the
+    same list/task order the API returns them. Rebuilt from every full
+    snapshot and kept current by the mutation helpers below.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, title):
+        with self._lock:
+            return self._entries.get(_normalize_title(title))
+
+    def add(self, title, task_id, list_id):
+        key = _normalize_title(title)
+        if not key or not task_id:
+            return
+        with self._lock:
+            self._entries.setdefault(key, (task_id, list_id))
+
+    def remove(self, title, task_id=None):
+        key = _normalize_title(title)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and (task_id is None or entry[0] == task_id):
+                del self._entries[key]
+
+    def remove_list(self, list_id):
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if v[1] != list_id}
+
+    def replace(self, entries):
+        with self._lock:
+            self._entries = dict(entries)
+
+
+_title_index = _TaskTitleIndex()
+
+
+# -----------------------------
+# Task-list directory: normalized list name -> list_id
+# -----------------------------
+class _TaskListDirectory:
+    """
+    Cached name -> id map of task lists, loaded once (from the local store
+    when it has been synced, else from the API) and kept coherent by
+    create_task_list/delete_task_list and every sync.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = None
+
+    def _ensure_loaded(self):
+        if self._ids is None:
+            lists = _task_store.lists() or list(iter_task_lists())
+            self.replace(lists)
+
+    def get(self, name):
+        self._ensure_loaded()
+        with self._lock:
+            return self._ids.get(_normalize_title(name))
+
+    def add(self, tlist):
+        with self._lock:
+            if self._ids is not None:
+                self._ids.setdefault(_normalize_title(tlist.get("title")), tlist["id"])
+
+    def remove(self, list_id):
+        with self._lock:
+            if self._ids is not None:
+                self._ids = {k: v for k, v in self._ids.items() if v != list_id}
+
+    def replace(self, tasklists):
+        ids = {}
+        for tlist in tasklists:
+            ids.setdefault(_normalize_title(tlist.get("title")), tlist["id"])
+        with self._lock:
+            self._ids = ids
+
+
+_list_directory = _TaskListDirectory()
+
+
+def _resolve_task_list(name: str, create: bool = False):
+    """
+    Map a list name to its id through the directory. A miss triggers one
+    refresh from the API (the list may have been created elsewhere) and,
+    with create=True, creates the list.
+    """
+    list_id = _list_directory.get(name)
+    if list_id:
+        return list_id
+    _list_directory.replace(list(iter_task_lists()))
+    list_id = _list_directory.get(name)
+    if list_id or not create:
+        return list_id
     service = get_tasks_service()
-    all_tasks = []
+    created = service.tasklists().insert(body={"title": name}).execute()
+    _list_directory.add(created)
+    _task_store.add_list(created)
+    return created["id"]
+
+
+def iter_task_lists(service=None):
+    service = service or get_tasks_service()
+    return _iter_pages(service.tasklists().list, fields=TASKLIST_FIELDS)
+
+
+# -----------------------------
+# Concurrent per-list fetching: one client per worker thread
+# (httplib2 connections are not thread-safe, the credentials are shared)
+# -----------------------------
+FETCH_WORKERS = 8
+_thread_local = threading.local()
+_fetch_pool = None
+_revalidate_pool = None
+_fetch_pool_lock = threading.Lock()
+
+
+def _get_thread_service():
+    if threading.current_thread() is threading.main_thread():
+        return get_tasks_service()
+    # Also refreshes or replaces _creds; a client bound to older credentials is rebuilt
+    get_tasks_service()
+    creds = _creds
+    service = getattr(_thread_local, "service", None)
+    if service is None or _thread_local.creds is not creds:
+        service = build("tasks", "v1", credentials=creds, cache_discovery=False)
+        _thread_local.service = service
+        _thread_local.creds = creds
+    return service
+
+
+def _get_fetch_pool():
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="tasks-fetch")
+        return _fetch_pool
+
+
+def _get_revalidate_pool():
+    """One long-lived worker for background syncs, so its thread-local client is reused."""
+    global _revalidate_pool
+    with _fetch_pool_lock:
+        if _revalidate_pool is None:
+            _revalidate_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tasks-revalidate")
+        return _revalidate_pool
+
+
+def _fetch_list_items(list_id, params):
+    service = _get_thread_service()
+    return list(_iter_pages(service.tasks().list, tasklist=list_id, **params))
+
+
+# -----------------------------
+# Persistent task store (SQLite) + incremental sync
+# -----------------------------
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasklists (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    position INTEGER NOT NULL DEFAULT 0,
+    updated_min TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    list_id TEXT NOT NULL,
+    title TEXT,
+    title_norm TEXT,
+    due TEXT,
+    due_date TEXT,
+    status TEXT,
+    updated TEXT,
+    etag TEXT,
+    hidden INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS idx_tasks_title_norm ON tasks (title_norm);
+CREATE INDEX IF NOT EXISTS idx_tasks_list_id ON tasks (list_id);
+"""
+
+_RECORD_SQL = """
+SELECT t.id, t.title, t.due, t.status, l.title, l.id
+FROM tasks t JOIN tasklists l ON l.id = t.list_id
+WHERE t.hidden = 0 {where}
+ORDER BY l.position, t.rowid
+"""
+RECORD_CHUNK = 200  # rows per fetchmany() when streaming records
+
+
+class _TaskStore:
+    """
+    On-disk mirror of every task list, so reads are served locally even on
+    a cold start. Each list keeps a high-water mark (the newest `updated`
+    timestamp seen from the server) that is sent back as updatedMin, so a
+    sync only downloads what changed since the last one.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            # WAL lets a streaming reader (iter_records) run alongside a sync's writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+            if "etag" not in columns:
+                self._conn.execute("ALTER TABLE tasks ADD COLUMN etag TEXT")
+        return self._conn
+
+    def last_sync(self):
+        with self._lock:
+            row = self._db().execute("SELECT value FROM meta WHERE key = 'last_sync'").fetchone()
+        return float(row[0]) if row else None
+
+    def high_water_marks(self):
+        with self._lock:
+            return dict(self._db().execute("SELECT id, updated_min FROM tasklists"))
+
+    def apply_lists(self, tasklists):
+        """Adopt the server's list order/titles, dropping lists that are gone."""
+        with self._lock, self._db() as db:
+            ids = [t["id"] for t in tasklists]
+            for position, tlist in enumerate(tasklists):
+                db.execute(
+                    "INSERT INTO tasklists (id, title, position) VALUES (?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET title = excluded.title, position = excluded.position",
+                    (tlist["id"], tlist.get("title"), position),
+                )
+            marks = ",".join("?" * len(ids))
+            db.execute(f"DELETE FROM tasks WHERE list_id NOT IN ({marks})", ids)
+            db.execute(f"DELETE FROM tasklists WHERE id NOT IN ({marks})", ids)
+
+    def apply_delta(self, list_id, items):
+        """Apply changed items from the server and advance the high-water mark."""
+        with self._lock, self._db() as db:
+            newest = None
+            for item in items:
+                self._apply_item(db, list_id, item)
+                updated = item.get("updated")
+                if updated and (newest is None or updated > newest):
+                    newest = updated
+            if newest:
+                db.execute(
+                    "UPDATE tasklists SET updated_min = ? WHERE id = ? AND (updated_min IS NULL OR updated_min < ?)",
+                    (newest, list_id, newest),
+                )
+            return len(items)
+
+    def apply_local(self, list_id, item):
+        """Apply our own write without moving the high-water mark."""
+        with self._lock, self._db() as db:
+            self._apply_item(db, list_id, item)
+
+    def add_list(self, tlist):
+        with self._lock, self._db() as db:
+            db.execute(
+                "INSERT OR IGNORE INTO tasklists (id, title, position) "
+                "VALUES (?, ?, (SELECT COALESCE(MAX(position), -1) + 1 FROM tasklists))",
+                (tlist["id"], tlist.get("title")),
+            )
+
+    def remove_list(self, list_id):
+        with self._lock, self._db() as db:
+            db.execute("DELETE FROM tasks WHERE list_id = ?", (list_id,))
+            db.execute("DELETE FROM tasklists WHERE id = ?", (list_id,))
+
+    def mark_synced(self):
+        with self._lock, self._db() as db:
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_sync', ?)", (str(time.time()),))
+
+    @staticmethod
+    def _apply_item(db, list_id, item):
+        if item.get("deleted"):
+            db.execute("DELETE FROM tasks WHERE id = ?", (item.get("id"),))
+            return
+        due = item.get("due")
+        db.execute(
+            "INSERT INTO tasks (id, list_id, title, title_norm, due, due_date, status, updated, etag, hidden) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET list_id = excluded.list_id, title = excluded.title, "
+            "title_norm = excluded.title_norm, due = excluded.due, due_date = excluded.due_date, "
+            "status = excluded.status, updated = excluded.updated, etag = excluded.etag, "
+            "hidden = excluded.hidden",
+            (
+                item["id"], list_id, item.get("title"), _normalize_title(item.get("title")),
+                due, _parse_due_date_string(due), item.get("status"), item.get("updated"),
+                item.get("etag"), 1 if item.get("hidden") else 0,
+            ),
+        )
+
+    def records(self, where="", params=()):
+        with self._lock:
+            rows = self._db().execute(_RECORD_SQL.format(where=where), params).fetchall()
+        return [self._record(r) for r in rows]
+
+    def iter_records(self, where="", params=()):
+        """
+        records(), streamed RECORD_CHUNK rows at a time from a private read
+        connection, so memory stays flat however many tasks there are.
+        """
+        with self._lock:
+            self._db()  # schema and WAL mode in place
+        conn = sqlite3.connect(self.path)
+        try:
+            cursor = conn.execute(_RECORD_SQL.format(where=where), params)
+            while True:
+                rows = cursor.fetchmany(RECORD_CHUNK)
+                if not rows:
+                    return
+                for r in rows:
+                    yield self._record(r)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _record(r):
+        return {"id": r[0], "title": r[1], "due": r[2], "status": r[3], "list": r[4], "list_id": r[5]}
+
+    def etag(self, task_id):
+        with self._lock:
+            row = self._db().execute("SELECT etag FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return row[0] if row else None
+
+    def lists(self):
+        with self._lock:
+            rows = self._db().execute("SELECT id, title FROM tasklists ORDER BY position").fetchall()
+        return [{"id": r[0], "title": r[1]} for r in rows]
+
+    def find_by_title(self, title_norm):
+        rows = self.records("AND t.title_norm = ?", (title_norm,))
+        return rows[0] if rows else None
+
+
+_task_store = _TaskStore(TASKS_CACHE_DB)
+_sync_lock = threading.Lock()
+_revalidating = threading.Event()
+REVALIDATE_AFTER = 5  # seconds a synced store is served without a background refresh
+
+
+def sync_tasks(concurrent: bool = True):
+    """
+    Bring the local store up to date. Lists are re-listed (one small call);
+    each list is then asked only for tasks updated since its high-water mark,
+    including deleted and hidden ones, which are applied to the store.
+    Returns the number of changed items received.
+    """
+    with _sync_lock:
+        service = _get_thread_service()
+        tasklists = list(iter_task_lists(service))
+        _task_store.apply_lists(tasklists)
+        _list_directory.replace(tasklists)
+        marks = _task_store.high_water_marks()
+
+        def params_for(list_id):
+            params = {"showCompleted": True, "showDeleted": True, "showHidden": True, "fields": TASK_FIELDS}
+            if marks.get(list_id):
+                params["updatedMin"] = marks[list_id]
+            return params
+
+        if concurrent and len(tasklists) > 1:
+            pool = _get_fetch_pool()
+            futures = [(t["id"], pool.submit(_fetch_list_items, t["id"], params_for(t["id"]))) for t in tasklists]
+            deltas = [(list_id, future.result()) for list_id, future in futures]
+        else:
+            deltas = [
+                (t["id"], list(_iter_pages(service.tasks().list, tasklist=t["id"], **params_for(t["id"]))))
+                for t in tasklists
+            ]
+
+        changed = sum(_task_store.apply_delta(list_id, items) for list_id, items in deltas)
+        _task_store.mark_synced()
+
+        snapshot = {}
+        for record in _task_store.records():
+            key = _normalize_title(record["title"])
+            if key and key not in snapshot:
+                snapshot[key] = (record["id"], record["list_id"])
+        _title_index.replace(snapshot)
+        return changed
+
+
+def _background_sync(concurrent):
     try:
-        tasklists = service.tasklists().list().execute().get("items", [])
-    except Exception:
-        return []
+        sync_tasks(concurrent=concurrent)
+    except Exception as e:
+        print(f"Background task sync failed: {e}")
+    finally:
+        _revalidating.clear()
+
+
+def _revalidate(concurrent: bool = True):
+    """
+    Stale-while-revalidate: a store that has never been synced is filled
+    synchronously; otherwise reads are served from disk and a background
+    sync is started once the last one is older than REVALIDATE_AFTER.
+    """
+    last = _task_store.last_sync()
+    if last is None:
+        try:
+            sync_tasks(concurrent=concurrent)
+        except Exception as e:
+            print(f"Initial task sync failed: {e}")
+        return
+    if time.time() - last < REVALIDATE_AFTER or _revalidating.is_set():
+        return
+    _revalidating.set()
+    _get_revalidate_pool().submit(_background_sync, concurrent)
+
+
+def iter_all_tasks(show_completed: bool = True, concurrent: bool = True):
+    """
+    Stream every task across all lists as a flat dict in task-list order,
+    served from the local store (revalidated in the background).
+    """
+    _revalidate(concurrent)
+    where = "" if show_completed else "AND t.status != 'completed'"
+    yield from _task_store.iter_records(where)
+
+
+def get_all_tasks():
+    return list(iter_all_tasks())
+
 
-    for tlist in tasklists:
-        tasks = service.tasks().list(tasklist=tlist["id"], showCompleted=True).execute().get("items", [])
-        for task in tasks:
-            all_tasks.append({
-                "id": task.get("id"),
-                "title": task.get("title"),
-                "due": task.get("due"),
-                "status": task.get("status"),
-                "list": tlist.get("title")
-            })
-    return all_tasks
+def _pending_tasks_where(where="", params=()):
+    _revalidate()
+    return _task_store.records("AND t.status != 'completed' " + where, params)
 
 
 # -----------------------------
 # GET PENDING TASKS (exported)
 # -----------------------------
 def get_pending_tasks():
-    return [t for t in get_all_tasks() if t.get("status") != "completed"]
+    return _pending_tasks_where()
 
 
 # -----------------------------
 # GET COMPLETED TASKS (exported)
 # -----------------------------
 def get_completed_tasks():
-    return [t for t in get_all_tasks() if t.get("status") == "completed"]
+    _revalidate()
+    return _task_store.records("AND t.status = 'completed'")
 
 def _parse_due_date_string(due_str):
     """Return date string YYYY-MM-DD for comparing. If None -> None"""
@@ -281,42 +754,20 @@ def _parse_due_date_string(due_str):
 
 def get_tasks_due_today():
     today = datetime.now().strftime("%Y-%m-%d")
-    return [t for t in get_pending_tasks() if _parse_due_date_string(t.get("due")) == today]
+    return _pending_tasks_where("AND t.due_date = ?", (today,))
 
 def get_tasks_due_tomorrow():
     tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-    return [t for t in get_pending_tasks() if _parse_due_date_string(t.get("due")) == tomorrow]
+    return _pending_tasks_where("AND t.due_date = ?", (tomorrow,))
 
 def get_upcoming_tasks(days: int = 7):
     start = datetime.now().date()
     end = start + timedelta(days=days)
-    out = []
-    for t in get_pending_tasks():
-        d = _parse_due_date_string(t.get("due"))
-        if not d:
-            continue
-        try:
-            ddate = datetime.strptime(d, "%Y-%m-%d").date()
-            if start <= ddate <= end:
-                out.append(t)
-        except Exception:
-            continue
-    return out
+    return _pending_tasks_where("AND t.due_date BETWEEN ? AND ?", (start.isoformat(), end.isoformat()))
 
 def get_overdue_tasks():
     today = datetime.now().date()
-    out = []
-    for t in get_pending_tasks():
-        d = _parse_due_date_string(t.get("due"))
-        if not d:
-            continue
-        try:
-            ddate = datetime.strptime(d, "%Y-%m-%d").date()
-            if ddate < today:
-                out.append(t)
-        except Exception:
-            continue
-    return out
+    return _pending_tasks_where("AND t.due_date < ?", (today.isoformat(),))
 
 
 # -----------------------------
@@ -326,48 +777,154 @@ def search_tasks(query: str):
     q = (query or "").strip().lower()
     if not q:
         return []
-    return [t for t in get_all_tasks() if q in (t.get("title") or "").lower() or q in (t.get("list") or "").lower()]
+    return [t for t in iter_all_tasks() if q in (t.get("title") or "").lower() or q in (t.get("list") or "").lower()]
 
 
 # -----------------------------
 # TASK STATISTICS (exported)
 # -----------------------------
-def get_task_statistics():
-    all_tasks = get_all_tasks()
-    total = len(all_tasks)
-    completed = len([t for t in all_tasks if t.get("status") == "completed"])
-    pending = total - completed
-    overdue = len(get_overdue_tasks())
-    due_today = len(get_tasks_due_today())
-    due_tomorrow = len(get_tasks_due_tomorrow())
-    upcoming_7 = len(get_upcoming_tasks(7))
+def _due_date(task):
+    d = _parse_due_date_string(task.get("due"))
+    if not d:
+        return None
+    try:
+        return datetime.strptime(d, "%Y-%m-%d").date()
+    except Exception:
+        return None
+
+
+def get_task_statistics(tasks=None):
+    """
+    Compute every counter from a single snapshot (fetched once if not given).
+    Pending tasks are bucketed by due date in one pass; the date-range
+    counters are then summed from the buckets.
+    """
+    if tasks is None:
+        tasks = iter_all_tasks()
+    today = datetime.now().date()
+
+    total = 0
+    completed = 0
+    due_buckets = Counter()
+    for t in tasks:
+        total += 1
+        if t.get("status") == "completed":
+            completed += 1
+            continue
+        ddate = _due_date(t)
+        if ddate:
+            due_buckets[ddate] += 1
+
+    week_end = today + timedelta(days=7)
     return {
         "total": total,
         "completed": completed,
-        "pending": pending,
-        "overdue": overdue,
-        "due_today": due_today,
-        "due_tomorrow": due_tomorrow,
-        "upcoming_7_days": upcoming_7
+        "pending": total - completed,
+        "overdue": sum(n for d, n in due_buckets.items() if d < today),
+        "due_today": due_buckets[today],
+        "due_tomorrow": due_buckets[today + timedelta(days=1)],
+        "upcoming_7_days": sum(n for d, n in due_buckets.items() if today <= d <= week_end)
     }
 
 
 # -----------------------------
 # Helpers: find task by exact title (case-insensitive) across lists
 # -----------------------------
+def _lookup_title(title_norm):
+    entry = _title_index.get(title_norm)
+    if entry:
+        return entry
+    record = _task_store.find_by_title(title_norm)
+    if record:
+        _title_index.add(record["title"], record["id"], record["list_id"])
+        return record["id"], record["list_id"]
+    return None
+
+
 def _find_task_by_title_exact(title: str):
+    """
+    Resolve a title through the local index and fetch just that task.
+    Falls back to a sync of the store only when the title is unknown or
+    the indexed task no longer matches.
+    """
     if not title:
         return None, None  # (task_dict, tasklist_id)
-    title_norm = title.strip().lower()
+    title_norm = _normalize_title(title)
     service = get_tasks_service()
-    for lst in get_task_lists():
-        tasks = service.tasks().list(tasklist=lst["id"], showCompleted=True).execute().get("items", [])
-        for t in tasks:
-            if (t.get("title") or "").strip().lower() == title_norm:
-                return t, lst["id"]
+
+    for attempt in range(2):
+        if attempt:
+            sync_tasks()
+        entry = _lookup_title(title_norm)
+        if not entry:
+            continue
+        task_id, list_id = entry
+        task = None
+        try:
+            task = service.tasks().get(tasklist=list_id, task=task_id).execute()
+        except HttpError as e:
+            if e.resp.status not in (404, 410):
+                raise
+        if task and not task.get("deleted") and _normalize_title(task.get("title")) == title_norm:
+            return task, list_id
+        _title_index.remove(title_norm, task_id)
+        _task_store.apply_local(list_id, task or {"id": task_id, "deleted": True})
     return None, None
 
 
+# -----------------------------
+# Minimal-diff writes: PATCH only the changed fields, conditional on ETag
+# -----------------------------
+def _forget_task(title, task_id, list_id):
+    _title_index.remove(title, task_id)
+    _task_store.apply_local(list_id, {"id": task_id, "deleted": True})
+
+
+def _patch_task(service, task_id, list_id, changes, etag=None):
+    request = service.tasks().patch(tasklist=list_id, task=task_id, body=changes)
+    if etag:
+        request.headers["If-Match"] = etag
+    updated = request.execute()
+    _task_store.apply_local(list_id, updated)
+    return updated
+
+
+def _patch_task_by_title(task_title: str, changes: dict):
+    """
+    PATCH `changes` onto the task with this exact title, resolved from the
+    local index without reading the task first. The write is conditional on
+    the cached ETag; a 412 means someone else edited the task, so only then
+    is it re-read and the patch retried against the fresh ETag.
+    Returns (updated_task, list_id).
+    """
+    title_norm = _normalize_title(task_title)
+    service = get_tasks_service()
+    for attempt in range(2):
+        if attempt:
+            sync_tasks()
+        entry = _lookup_title(title_norm)
+        if not entry:
+            continue
+        task_id, list_id = entry
+        try:
+            return _patch_task(service, task_id, list_id, changes, _task_store.etag(task_id)), list_id
+        except HttpError as e:
+            if e.resp.status in (404, 410):
+                _forget_task(title_norm, task_id, list_id)
+                continue
+            if e.resp.status != 412:
+                raise
+
+        current = service.tasks().get(tasklist=list_id, task=task_id).execute()
+        _task_store.apply_local(list_id, current)
+        if _normalize_title(current.get("title")) != title_norm:
+            # renamed concurrently: the index entry is stale
+            _title_index.remove(title_norm, task_id)
+            continue
+        return _patch_task(service, task_id, list_id, changes, current.get("etag")), list_id
+    raise ValueError("Task not found")
+
+
 # -----------------------------
 # COMPLETE TASK (exported)
 # -----------------------------
@@ -376,14 +933,7 @@ def complete_task(task_title: str):
     Mark task with exact title as completed (first match).
     Returns updated task dict or raises.
     """
-    task, list_id = _find_task_by_title_exact(task_title)
-    if not task:
-        raise ValueError("Task not found")
-    # Mark completed
-    task["status"] = "completed"
-    task["completed"] = to_rfc3339(datetime.now())
-    service = get_tasks_service()
-    updated = service.tasks().update(tasklist=list_id, task=task["id"], body=task).execute()
+    updated, _ = _patch_task_by_title(task_title, {"status": "completed", "completed": to_rfc3339(datetime.now())})
     return updated
 
 
@@ -391,12 +941,25 @@ def complete_task(task_title: str):
 # DELETE TASK (exported)
 # -----------------------------
 def delete_task(task_title: str):
-    task, list_id = _find_task_by_title_exact(task_title)
-    if not task:
-        raise ValueError("Task not found")
+    title_norm = _normalize_title(task_title)
     service = get_tasks_service()
-    service.tasks().delete(tasklist=list_id, task=task["id"]).execute()
-    return {"status": "deleted", "title": task_title}
+    for attempt in range(2):
+        if attempt:
+            sync_tasks()
+        entry = _lookup_title(title_norm)
+        if not entry:
+            continue
+        task_id, list_id = entry
+        try:
+            service.tasks().delete(tasklist=list_id, task=task_id).execute()
+        except HttpError as e:
+            if e.resp.status not in (404, 410):
+                raise
+            _forget_task(title_norm, task_id, list_id)
+            continue
+        _forget_task(title_norm, task_id, list_id)
+        return {"status": "deleted", "title": task_title}
+    raise ValueError("Task not found")
 
 
 def update_task(task_title: str, new_title: str = None, new_due_raw: str = None):
@@ -404,13 +967,11 @@ def update_task(task_title: str, new_title: str = None, new_due_raw: str = None)
     Update a task's title and/or due date.
     new_due_raw may be a natural-language string or a tuple (date_str,time_str).
     """
-    task, list_id = _find_task_by_title_exact(task_title)
-    if not task:
-        raise ValueError("Task not found")
+    changes = {}
 
     # Update title
     if new_title:
-        task["title"] = new_title
+        changes["title"] = new_title
 
     # Update due
     if new_due_raw:
@@ -422,12 +983,20 @@ def update_task(task_title: str, new_title: str = None, new_due_raw: str = None)
             try:
                 hour_min = time_str or "09:00"
                 dt = datetime.strptime(f"{date_str} {hour_min}", "%Y-%m-%d %H:%M")
-                task["due"] = to_rfc3339(dt)
+                changes["due"] = to_rfc3339(dt)
             except Exception:
-                task["due"] = f"{date_str}T{time_str}:00.000Z" if time_str else f"{date_str}T09:00:00.000Z"
+                changes["due"] = f"{date_str}T{time_str}:00.000Z" if time_str else f"{date_str}T09:00:00.000Z"
 
-    service = get_tasks_service()
-    updated = service.tasks().update(tasklist=list_id, task=task["id"], body=task).execute()
+    if not changes:
+        task, _ = _find_task_by_title_exact(task_title)
+        if not task:
+            raise ValueError("Task not found")
+        return task
+
+    updated, list_id = _patch_task_by_title(task_title, changes)
+    if new_title:
+        _title_index.remove(task_title, updated["id"])
+        _title_index.add(new_title, updated["id"], list_id)
     return updated
 
 
@@ -441,68 +1010,64 @@ def reschedule_task(task_title: str, new_due_raw: str):
 def create_task_list(name: str):
     service = get_tasks_service()
     created = service.tasklists().insert(body={"title": name}).execute()
+    _list_directory.add(created)
+    _task_store.add_list(created)
     return {"status": "created", "id": created.get("id"), "title": created.get("title")}
 
 def delete_task_list(name: str):
-    # find list by exact name
-    for lst in get_task_lists():
-        if lst["title"].strip().lower() == name.strip().lower():
-            service = get_tasks_service()
-            service.tasklists().delete(tasklist=lst["id"]).execute()
-            return {"status": "deleted", "title": name}
-    raise ValueError("Task list not found")
-
-def get_task_lists():
+    list_id = _resolve_task_list(name)
+    if not list_id:
+        raise ValueError("Task list not found")
     service = get_tasks_service()
-    return service.tasklists().list().execute().get("items", [])
+    service.tasklists().delete(tasklist=list_id).execute()
+    _list_directory.remove(list_id)
+    _title_index.remove_list(list_id)
+    _task_store.remove_list(list_id)
+    return {"status": "deleted", "title": name}
 
 # In google_tasks.py - ADD THESE FUNCTIONS
 
+# Recurrence is only read from phrases ("every monday", "daily at 9am",
+# "weekly on fri", "monthly on the 15th"), so a title such as "daily
+# standup review tomorrow" or "monthly report" is not a repeat.
+_RECUR_DAY = (r"(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+              r"|mon|tues?|wed|thu(?:rs?)?|fri|sat|sun)")
+DAILY_RE = re.compile(r"\bevery\s+day\b|\bdaily\b(?=\s*(?:$|at\b|from\b|starting\b|until\b|for\b|\d))")
+WORKDAYS_RE = re.compile(r"\bevery\s+weekday\b")
+EVERY_DAYS_RE = re.compile(rf"\bevery\s+({_RECUR_DAY}(?:\s*(?:,|and|&)\s*{_RECUR_DAY})*)\b")
+WEEKLY_RE = re.compile(rf"\bweekly\s+(?:on\s+)?({_RECUR_DAY})\b")
+MONTHLY_RE = re.compile(r"\b(?:monthly|every\s+month)\s+(?:on\s+)?(?:the\s+)?(\d{1,2})(?:st|nd|rd|th)?\b")
+RECUR_DAY_RE = re.compile(rf"\b{_RECUR_DAY}\b")
+RECUR_WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+
 def parse_recurrence_pattern(user_input):
     """
     Parse recurrence patterns from user input
-    Returns: (pattern_type, pattern_details)
+    Returns: (pattern_type, pattern_details), or (None, None)
     """
-    import re
-    
     input_lower = user_input.lower()
-    
-    # Daily pattern
-    if 'daily' in input_lower or 'every day' in input_lower:
-        return 'daily', {'interval': 1}
-    
-    # Weekly pattern - single day
-    weekly_match = re.search(r'weekly\s+(\w+)', input_lower)
-    if weekly_match:
-        day = weekly_match.group(1)
-        days_map = {
-            'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
-            'friday': 4, 'saturday': 5, 'sunday': 6,
-            'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3,
-            'fri': 4, 'sat': 5, 'sun': 6
-        }
-        if day in days_map:
-            return 'weekly', {'weekday': days_map[day]}
-    
-    # Monthly pattern
-    monthly_match = re.search(r'monthly\s+(\d+)(?:st|nd|rd|th)?', input_lower)
+
+    if DAILY_RE.search(input_lower):
+        return "daily", {"interval": 1}
+
+    if WORKDAYS_RE.search(input_lower):
+        return "weekly_multiple", {"weekdays": [0, 1, 2, 3, 4]}
+
+    # "every monday", "every mon, wed and fri", "weekly on thursday"
+    match = EVERY_DAYS_RE.search(input_lower) or WEEKLY_RE.search(input_lower)
+    if match:
+        weekdays = sorted({RECUR_WEEKDAYS[day[:3]] for day in RECUR_DAY_RE.findall(match.group(1))})
+        if len(weekdays) == 1:
+            return "weekly", {"weekday": weekdays[0]}
+        return "weekly_multiple", {"weekdays": weekdays}
+
+    monthly_match = MONTHLY_RE.search(input_lower)
     if monthly_match:
         day_of_month = int(monthly_match.group(1))
         if 1 <= day_of_month <= 31:
-            return 'monthly', {'day': day_of_month}
-    
-    # Multiple weekdays
-    if 'every' in input_lower and ('and' in input_lower or ',' in input_lower):
-        days = re.findall(r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b', input_lower)
-        if days:
-            days_map = {
-                'monday': 0, 'tuesday': 1, 'wednesday': 2, 'thursday': 3,
-                'friday': 4, 'saturday': 5, 'sunday': 6
-            }
-            weekdays = [days_map[d] for d in days if d in days_map]
-            if weekdays:
-                return 'weekly_multiple', {'weekdays': weekdays}
-    
+            return "monthly", {"day": day_of_month}
+
     return None, None
 
 def generate_recurring_dates(start_date, recurrence_type, recurrence_details, count=5):
@@ -573,15 +1138,7 @@ def move_task_between_lists(task_title: str, dest_list_name: str):
 
     service = get_tasks_service()
 
-    # find or create dest list
-    dest_id = None
-    for lst in get_task_lists():
-        if lst["title"].strip().lower() == dest_list_name.strip().lower():
-            dest_id = lst["id"]
-            break
-    if not dest_id:
-        created = service.tasklists().insert(body={"title": dest_list_name}).execute()
-        dest_id = created.get("id")
+    dest_id = _resolve_task_list(dest_list_name, create=True)
 
     # build copy body
     copy_body = {
@@ -597,9 +1154,177 @@ def move_task_between_lists(task_title: str, dest_list_name: str):
     new_task = service.tasks().insert(tasklist=dest_id, body=copy_body).execute()
     # delete original
     service.tasks().delete(tasklist=src_list_id, task=task["id"]).execute()
+    _title_index.remove(task_title, task["id"])
+    _title_index.add(task.get("title"), new_task.get("id"), dest_id)
+    _task_store.apply_local(src_list_id, {"id": task["id"], "deleted": True})
+    _task_store.apply_local(dest_id, new_task)
     return {"status": "moved", "old_list": src_list_id, "new_list": dest_id, "title": task.get("title"), "new_id": new_task.get("id")}
 
 
+# -----------------------------
+# BULK MUTATIONS (exported)
+# -----------------------------
+BATCH_SIZE = 50  # the API accepts up to 1000 calls per batch, but large batches get throttled
+
+
+def _execute_batched(requests):
+    """
+    Run [(key, HttpRequest)] through BatchHttpRequest in chunks of BATCH_SIZE.
+    Returns {key: (response, exception)}. A chunk whose batch call fails
+    outright reports that error for each of its calls not already answered;
+    the other chunks still run.
+    """
+    service = get_tasks_service()
+    results = {}
+
+    def callback(request_id, response, exception):
+        results[request_id] = (response, exception)
+
+    for start in range(0, len(requests), BATCH_SIZE):
+        chunk = requests[start:start + BATCH_SIZE]
+        try:
+            batch = service.new_batch_http_request(callback=callback)
+            for key, request in chunk:
+                batch.add(request, request_id=key)
+            batch.execute()
+        except Exception as e:
+            print(f"Batch of {len(chunk)} task calls failed: {e}")
+            for key, _ in chunk:
+                results.setdefault(key, (None, e))
+    return results
+
+
+def _resolve_titles(titles):
+    """
+    Map each title to a distinct (task_id, list_id), first match in list
+    order, so repeated titles pick successive duplicates. Syncs once if any
+    title is unknown locally.
+    """
+    def resolve():
+        used = set()
+        out = []
+        for title in titles:
+            match = None
+            for record in _task_store.records("AND t.title_norm = ?", (_normalize_title(title),)):
+                if record["id"] not in used:
+                    match = record
+                    used.add(record["id"])
+                    break
+            out.append(match)
+        return out
+
+    matches = resolve()
+    if any(m is None for m in matches):
+        try:
+            sync_tasks()
+        except Exception:
+            return matches
+        matches = resolve()
+    return matches
+
+
+def create_tasks(user_inputs):
+    """
+    Create many tasks from natural sentences with batched inserts.
+    Due dates are parsed in one parse_datetimes_from_texts() pass.
+    Returns one result dict per input, in order (same shape as create_task,
+    or {"status": "error", ...}).
+    """
+    service = get_tasks_service()
+    user_inputs = list(user_inputs)
+    dues = parse_datetimes_from_texts(user_inputs)
+    parsed = [_parse_task_input(text, due) for text, due in zip(user_inputs, dues)]
+    list_ids = {}
+    for _, _, _, list_name, _ in parsed:
+        key = _normalize_title(list_name)
+        if key not in list_ids:
+            list_ids[key] = _resolve_task_list(list_name, create=True)
+
+    requests = []
+    for i, (_, _, _, list_name, body) in enumerate(parsed):
+        list_id = list_ids[_normalize_title(list_name)]
+        requests.append((str(i), service.tasks().insert(tasklist=list_id, body=body)))
+    responses = _execute_batched(requests)
+
+    results = []
+    for i, (title, date_str, time_str, list_name, _) in enumerate(parsed):
+        created, error = responses.get(str(i), (None, None))
+        if error is not None or not created:
+            results.append({"status": "error", "title": title, "message": str(error)})
+            continue
+        list_id = list_ids[_normalize_title(list_name)]
+        _title_index.add(title, created.get("id"), list_id)
+        _task_store.apply_local(list_id, created)
+        results.append({"status": "success", "title": title, "date": date_str, "time": time_str, "list": list_name, "id": created.get("id")})
+    return results
+
+
+def complete_tasks(task_titles):
+    """
+    Mark many tasks (by exact title) completed with batched patches.
+    Returns one result dict per title, in order.
+    """
+    service = get_tasks_service()
+    titles = list(task_titles)
+    matches = _resolve_titles(titles)
+    completed_at = to_rfc3339(datetime.now())
+
+    requests = []
+    for i, match in enumerate(matches):
+        if match:
+            body = {"status": "completed", "completed": completed_at}
+            request = service.tasks().patch(tasklist=match["list_id"], task=match["id"], body=body)
+            etag = _task_store.etag(match["id"])
+            if etag:
+                request.headers["If-Match"] = etag
+            requests.append((str(i), request))
+    responses = _execute_batched(requests)
+
+    results = []
+    for i, (title, match) in enumerate(zip(titles, matches)):
+        if not match:
+            results.append({"status": "error", "title": title, "message": "Task not found"})
+            continue
+        updated, error = responses.get(str(i), (None, None))
+        if error is not None:
+            _title_index.remove(title, match["id"])
+            results.append({"status": "error", "title": title, "message": str(error)})
+            continue
+        _task_store.apply_local(match["list_id"], updated)
+        results.append({"status": "completed", "title": title, "id": match["id"]})
+    return results
+
+
+def delete_tasks(task_titles):
+    """
+    Delete many tasks (by exact title) with batched deletes.
+    Returns one result dict per title, in order.
+    """
+    service = get_tasks_service()
+    titles = list(task_titles)
+    matches = _resolve_titles(titles)
+
+    requests = [
+        (str(i), service.tasks().delete(tasklist=match["list_id"], task=match["id"]))
+        for i, match in enumerate(matches) if match
+    ]
+    responses = _execute_batched(requests)
+
+    results = []
+    for i, (title, match) in enumerate(zip(titles, matches)):
+        if not match:
+            results.append({"status": "error", "title": title, "message": "Task not found"})
+            continue
+        _, error = responses.get(str(i), (None, None))
+        if error is not None:
+            results.append({"status": "error", "title": title, "message": str(error)})
+            continue
+        _title_index.remove(title, match["id"])
+        _task_store.apply_local(match["list_id"], {"id": match["id"], "deleted": True})
+        results.append({"status": "deleted", "title": title})
+    return results
+
+
 # -----------------------------
 # Export compatibility names (some callers expect these names)
 # -----------------------------
@@ -610,7 +1335,10 @@ def move_task_between_lists(task_title: str, dest_list_name: str):
 # The module exports are the functions defined above.
 __all__ = [
     "get_tasks_service",
+    "reset_tasks_service",
     "parse_datetime_from_text",
+    "parse_datetimes_from_texts",
+    "get_datetime_parse_stats",
     "extract_task_title_from_natural_language",
     "extract_list_name_from_text",
     "create_task",
@@ -618,6 +1346,9 @@ __all__ = [
     "create_task_list",
     "delete_task_list",
     "get_all_tasks",
+    "iter_all_tasks",
+    "iter_task_lists",
+    "sync_tasks",
     "get_pending_tasks",
     "get_completed_tasks",
     "get_tasks_due_today",
@@ -631,4 +1362,7 @@ __all__ = [
     "update_task",
     "reschedule_task",
     "move_task_between_lists",
+    "create_tasks",
+    "complete_tasks",
+    "delete_tasks",
 ]
@@ -15,7 +15,9 @@ def split_into_commands(user_input: str):
         return f"__QUOTE_{len(quoted_sections)-1}__"
 
     protected_text = re.sub(r'["\'][^"\']*["\']', protect_quotes, user_input)
-    split_pattern = r'\s+(?:and|also|then)\s+|\s*;\s*|\s*,\s*|\.\s+(?=[A-Z])'
+    # A weekday after "and" or "," continues a list ("every mon, wed and fri"), not a new command
+    weekday = r'(?!\s*(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*\b)'
+    split_pattern = rf'\s+(?:and|also|then){weekday}\s+|\s*;\s*|\s*,{weekday}\s*|\.\s+(?=[A-Z])'
     parts = re.split(split_pattern, protected_text)
 
     for part in parts:
@@ -47,7 +49,8 @@ def handle_direct_event(cmd: str):
         f"on {event_time.strftime('%b %d')}"
     )
 
-    result = create_event(processed_input)
+    # The rewritten input drops recurrence wording ("every monday"), so pass it along
+    result = create_event(processed_input, recurrence=cmd)
 
     if isinstance(result, dict) and result.get("status") == "success":
         return (
@@ -14,11 +14,24 @@ from integrations import (
     create_event, get_formatted_events_today,
     get_formatted_events_tomorrow, get_formatted_upcoming_events,
     search_events, delete_event, get_calendar_statistics,
-    reschedule_event, parse_datetime_for_event,
+    reschedule_event, reschedule_event_series, parse_recurrence_pattern,
+    parse_datetime_for_event, find_free_slots,
     send_email, log_email, generate_email_content, extract_subject,
 )
 from email_scheduler import EmailScheduler
 
+# Availability requests only: "find me 30 minutes tomorrow", "any free slots
+# friday?", "when am i free". A bare "find me ..." is a search, and "open
+# time" inside a title ("create task open time tracker") is not a request.
+_FREE_DURATION = r'(?:\d+(?:\.\d+)?\s*(?:minutes?|mins?|hours?|hrs?|h)\b|half an hour|half hour|an hour)'
+FREE_TIME_RE = re.compile(
+    r'^(?:find|show|get|list|any)\s+(?:me\s+)?(?:some\s+|any\s+|an?\s+)?(?:free|open)\s+(?:time|slots?)\b'
+    r'|^(?:free|open)\s+(?:time|slots?)\b'
+    r'|\b(?:do|have)\s+i\s+(?:have|got)\s+(?:any\s+)?(?:free|open)\s+(?:time|slots?)\b'
+    r'|^find\s+me\s+(?:an?\s+)?' + _FREE_DURATION +
+    r'|\bwhen\s+am\s+i\s+(?:free|available)\b'
+)
+
 
 class SmartChatbot:
     def __init__(self):
@@ -178,7 +191,7 @@ class SmartChatbot:
         return f"Task '{query}' not found"
 
     def _task_statistics(self):
-        stats = get_task_statistics()
+        stats = get_task_statistics(self._get_cached('tasks', get_all_tasks))
         if isinstance(stats, dict):
             return (
                 f"Tasks: {stats.get('total', 0)} total, "
@@ -192,18 +205,18 @@ class SmartChatbot:
     def _view_calendar(self, text):
         try:
             if 'today' in text:
-                events = get_formatted_events_today()
+                events = get_formatted_events_today(limit=10)
                 title = "Today's Events"
             elif 'tomorrow' in text:
-                events = get_formatted_events_tomorrow()
+                events = get_formatted_events_tomorrow(limit=10)
                 title = "Tomorrow's Events"
             elif 'all' in text:
-                events = get_formatted_upcoming_events(30)
+                events = get_formatted_upcoming_events(30, limit=10)
                 title = "All Events"
             else:
                 days_match = re.search(r'(\d+)\s*days?', text)
                 days = int(days_match.group(1)) if days_match else 7
-                events = get_formatted_upcoming_events(days)
+                events = get_formatted_upcoming_events(days, limit=10)
                 title = f"Upcoming Events ({days} days)"
 
             if not events:
@@ -239,10 +252,20 @@ class SmartChatbot:
             return (
                 f"Calendar Stats: {stats.get('events_today', 0)} today, "
                 f"{stats.get('events_tomorrow', 0)} tomorrow, "
-                f"{stats.get('upcoming_week', 0)} this week"
+                f"{stats.get('upcoming_week', 0)} this week, "
+                f"busiest: {stats.get('busiest_day', 'Today')}"
             )
         return "Unable to get calendar statistics"
 
+    def _find_free_time(self, user_input):
+        slots = find_free_slots(user_input)
+        if not slots:
+            return "No free slots found in that window"
+        response = ["Free slots:"]
+        for slot in slots:
+            response.append(f"• {slot['display']}")
+        return "\n".join(response)
+
     def _delete_event(self, text):
         query = re.sub(
             r'\b(delete|remove|cancel|event|meeting|appointment)\b',
@@ -255,7 +278,11 @@ class SmartChatbot:
             return "No events found to delete"
         best_match, score = self._find_match(query, events)
         if best_match:
-            result = delete_event(best_match)
+            event_id = next(
+                (e.get('id') for e in events if (e.get('summary') or 'No title') == best_match),
+                None
+            )
+            result = delete_event(best_match, event_id=event_id)
             self.caches['events'] = None
             if result.get('status') == 'success':
                 return f"Event deleted: {best_match}"
@@ -269,9 +296,13 @@ class SmartChatbot:
         try:
             clean_title = extract_event_title(user_input)
             event_time = self.time_parser.extract_datetime(user_input)
-            start_time = event_time.strftime("%Y-%m-%d %H:%M")
-            # NOTE: you may still want to adapt this to your calendar API
-            result = create_event(title=clean_title, start_time=start_time)
+            processed_input = (
+                f"{clean_title} at {event_time.strftime('%I:%M %p')} "
+                f"on {event_time.strftime('%b %d')}"
+            )
+            # Keep any "every monday and wednesday" wording so the event
+            # is created as one series
+            result = create_event(processed_input, recurrence=user_input)
             if result.get('status') == 'success':
                 self.caches['events'] = None
                 response = f"Event created: {clean_title}"
@@ -624,6 +655,57 @@ class SmartChatbot:
                 return f"Error updating task: {str(e)}"
         return f"Task '{query}' not found"
 
+    def _reschedule_event(self, text, user_input):
+        """
+        "reschedule event standup to friday 10am" moves one event;
+        "reschedule event standup series to every tuesday at 9am" edits
+        the whole recurring series with one call.
+        """
+        parts = re.split(r'\s+to\s+', user_input, maxsplit=1, flags=re.IGNORECASE)
+        target = parts[0]
+        new_time_text = parts[1].strip() if len(parts) > 1 else ''
+        whole_series = re.search(
+            r'\b(series|all occurrences|every occurrence)\b', target, re.IGNORECASE
+        )
+        query = re.sub(
+            r'\b(reschedule|move|change|update|event|meeting|appointment|'
+            r'the|whole|series|all occurrences|every occurrence)\b',
+            '', target, flags=re.IGNORECASE
+        ).strip()
+        if not query:
+            return "Please specify which event to reschedule"
+        if not new_time_text:
+            return "Please specify the new time (e.g., 'to 8 dec 8am')"
+
+        events = self._get_cached('events', lambda: get_upcoming_events(30))
+        best_match, score = self._find_match(query, events)
+        if not best_match:
+            return f"Event '{query}' not found"
+        event = next(
+            (e for e in events if (e.get('summary') or 'No title') == best_match),
+            {}
+        )
+
+        if whole_series and event.get('recurringEventId'):
+            pattern_type, _ = parse_recurrence_pattern(new_time_text)
+            result = reschedule_event_series(
+                best_match, new_time_text, event_id=event.get('id'),
+                recurrence_input=new_time_text if pattern_type else None
+            )
+        else:
+            result = reschedule_event(
+                best_match, new_time_text, event_id=event.get('id')
+            )
+        self.caches['events'] = None
+        if result.get('status') == 'success':
+            return result.get('message') or (
+                f"Event '{best_match}' rescheduled to {new_time_text}"
+            )
+        return (
+            f"Failed to reschedule event: "
+            f"{result.get('message', 'Unknown error')}"
+        )
+
     def _reschedule_item(self, text, user_input):
         return (
             "Please specify what you want to reschedule: "
@@ -638,7 +720,9 @@ class SmartChatbot:
             "• show calendar / show events - View upcoming events\n"
             "• show events today/tomorrow - View specific day events\n"
             "• delete event [name] - Delete an event\n"
-            "• reschedule event [name] to [new time] - Move event to new time\n\n"
+            "• reschedule event [name] to [new time] - Move event to new time\n"
+            "• reschedule event [name] series to [new time] - Move a whole recurring series\n"
+            "• find me 30 minutes [tomorrow afternoon] | free slots [friday] - Find free slots\n\n"
             "Tasks:\n"
             "• create task [description] - Add new task\n"
             "• show tasks / show tasks today - View tasks\n"
@@ -655,7 +739,9 @@ class SmartChatbot:
         stats = []
         if TASKS_AVAILABLE:
             try:
-                task_stats = get_task_statistics()
+                task_stats = get_task_statistics(
+                    self._get_cached('tasks', get_all_tasks)
+                )
                 if isinstance(task_stats, dict):
                     stats.append(
                         f"Tasks: {task_stats.get('total', 0)} total, "
@@ -696,6 +782,9 @@ class SmartChatbot:
                 return self._reschedule_event(text, user_input)
             return self._reschedule_item(text, user_input)
 
+        if FREE_TIME_RE.search(text):
+            return self._find_free_time(user_input)
+
         if re.search(r'@[\w\.-]+\.\w+', text) and any(
             kw in text for kw in ['send', 'email']
         ):
@@ -0,0 +1,282 @@
+"""
+In-memory stand-ins for the googleapiclient Tasks and Calendar services.
+
+Only the calls the assistant makes are implemented, with the server-side
+behaviour it relies on: pagination, updatedMin and syncToken deltas,
+If-Match preconditions, 404/410/412 errors and batch requests. Every
+executed call is counted in `calls` by method name.
+"""
+import itertools
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+
+def http_error(status):
+    return HttpError(httplib2.Response({"status": status}), b"{}")
+
+
+class FakeRequest:
+    def __init__(self, service, name, fn):
+        self.service = service
+        self.name = name
+        self.fn = fn
+        self.headers = {}
+
+    def execute(self, **kwargs):
+        self.service.count(self.name)
+        return self.fn(self.headers)
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.requests.append((request, callback or self.callback, request_id))
+
+    def execute(self):
+        self.service.count("batch")
+        if self.service.failing_batches and self.service.calls["batch"] in self.service.failing_batches:
+            raise http_error(503)
+        for request, callback, request_id in self.requests:
+            try:
+                response, exception = request.fn(request.headers), None
+            except HttpError as e:
+                response, exception = None, e
+            callback(request_id, response, exception)
+
+
+class _FakeService:
+    def __init__(self, page_size=None):
+        self.page_size = page_size
+        self.calls = Counter()
+        self.params = []
+        self.failing_batches = set()  # 1-based numbers of batch calls that fail outright
+        self._lock = threading.Lock()
+
+    def count(self, name):
+        with self._lock:
+            self.calls[name] += 1
+
+    def new_batch_http_request(self, callback=None):
+        return FakeBatch(self, callback)
+
+    def _page(self, items, params):
+        size = min(params.get("maxResults") or len(items) + 1, self.page_size or len(items) + 1)
+        start = int(params.get("pageToken") or 0)
+        response = {"items": items[start:start + size]}
+        if start + size < len(items):
+            response["nextPageToken"] = str(start + size)
+        return response
+
+
+# -----------------------------
+# Tasks
+# -----------------------------
+class FakeTasksService(_FakeService):
+    """Task lists given as {list title: [task dicts]}, in list order."""
+
+    def __init__(self, lists=None, page_size=None):
+        super().__init__(page_size)
+        self.lists = {}
+        self._ids = itertools.count(1)
+        self._clock = itertools.count(1)
+        for title, tasks in (lists or {}).items():
+            list_id = self.add_list(title)
+            for task in tasks:
+                self.add_task(list_id, task)
+
+    def _now(self):
+        moment = datetime(2030, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=next(self._clock))
+        return moment.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+    def _etag(self):
+        return f'"etag-{next(self._ids)}"'
+
+    def add_list(self, title):
+        list_id = f"L{next(self._ids)}"
+        self.lists[list_id] = {"title": title, "tasks": {}}
+        return list_id
+
+    def list_id(self, title):
+        return next(list_id for list_id, tlist in self.lists.items() if tlist["title"] == title)
+
+    def add_task(self, list_id, body):
+        task = dict(body, id=f"T{next(self._ids)}", etag=self._etag(), updated=self._now())
+        task.setdefault("status", "needsAction")
+        self.lists[list_id]["tasks"][task["id"]] = task
+        return dict(task)
+
+    def edit_task(self, list_id, task_id, **changes):
+        """A change made by another client: new etag and updated time."""
+        task = self.lists[list_id]["tasks"][task_id]
+        task.update(changes, etag=self._etag(), updated=self._now())
+        return dict(task)
+
+    def live_task(self, list_id, task_id):
+        task = self.lists.get(list_id, {"tasks": {}})["tasks"].get(task_id)
+        if not task or task.get("deleted"):
+            raise http_error(404)
+        return task
+
+    def tasklists(self):
+        return _FakeTaskLists(self)
+
+    def tasks(self):
+        return _FakeTasks(self)
+
+
+class _FakeTaskLists:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, **params):
+        service = self.service
+        items = [{"id": list_id, "title": tlist["title"]} for list_id, tlist in service.lists.items()]
+        return FakeRequest(service, "tasklists.list", lambda headers: service._page(items, params))
+
+    def insert(self, body):
+        def run(headers):
+            return {"id": self.service.add_list(body["title"]), "title": body["title"]}
+        return FakeRequest(self.service, "tasklists.insert", run)
+
+    def delete(self, tasklist):
+        return FakeRequest(self.service, "tasklists.delete", lambda headers: self.service.lists.pop(tasklist) and "")
+
+
+class _FakeTasks:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, tasklist, **params):
+        service = self.service
+        service.params.append(dict(params, tasklist=tasklist))
+
+        def run(headers):
+            items = list(service.lists[tasklist]["tasks"].values())
+            if not params.get("showCompleted", True):
+                items = [t for t in items if t["status"] != "completed"]
+            if not params.get("showDeleted"):
+                items = [t for t in items if not t.get("deleted")]
+            if not params.get("showHidden"):
+                items = [t for t in items if not t.get("hidden")]
+            if params.get("updatedMin"):
+                items = [t for t in items if t["updated"] >= params["updatedMin"]]
+            return service._page([dict(t) for t in items], params)
+        return FakeRequest(service, "tasks.list", run)
+
+    def get(self, tasklist, task):
+        return FakeRequest(self.service, "tasks.get",
+                           lambda headers: dict(self.service.live_task(tasklist, task)))
+
+    def insert(self, tasklist, body):
+        def run(headers):
+            if tasklist not in self.service.lists:
+                raise http_error(404)
+            return self.service.add_task(tasklist, body)
+        return FakeRequest(self.service, "tasks.insert", run)
+
+    def delete(self, tasklist, task):
+        def run(headers):
+            self.service.live_task(tasklist, task)
+            self.service.edit_task(tasklist, task, deleted=True)
+            return ""
+        return FakeRequest(self.service, "tasks.delete", run)
+
+    def patch(self, tasklist, task, body):
+        def run(headers):
+            current = self.service.live_task(tasklist, task)
+            if headers.get("If-Match") and headers["If-Match"] != current["etag"]:
+                raise http_error(412)
+            return self.service.edit_task(tasklist, task, **body)
+        return FakeRequest(self.service, "tasks.patch", run)
+
+
+# -----------------------------
+# Calendar
+# -----------------------------
+class FakeCalendarService(_FakeService):
+    """
+    Events per calendar ID. Every change is appended to a change log and a
+    sync token is simply the log position it was issued at; setting
+    `expired` makes any incremental list call fail with 410 Gone.
+    """
+
+    def __init__(self, page_size=None):
+        super().__init__(page_size)
+        self.calendars = {"primary": {}}
+        self.expired = False
+        self._log = []
+        self._ids = itertools.count(1)
+
+    def _touch(self, calendar_id, event):
+        self.calendars.setdefault(calendar_id, {})[event["id"]] = event
+        self._log.append((calendar_id, event["id"]))
+
+    def add(self, summary, start, hours=1, calendar_id="primary", all_day=False, **extra):
+        """Add an event starting at the naive local datetime `start`."""
+        if all_day:
+            times = {"start": {"date": f"{start:%Y-%m-%d}"},
+                     "end": {"date": f"{start + timedelta(days=1):%Y-%m-%d}"}}
+        else:
+            times = {"start": {"dateTime": start.astimezone().isoformat()},
+                     "end": {"dateTime": (start + timedelta(hours=hours)).astimezone().isoformat()}}
+        event = dict(extra, id=extra.get("id") or f"E{next(self._ids)}", summary=summary, status="confirmed", **times)
+        self._touch(calendar_id, event)
+        return dict(event)
+
+    def cancel(self, event_id, calendar_id="primary"):
+        event = self.calendars[calendar_id][event_id]
+        event["status"] = "cancelled"
+        self._touch(calendar_id, event)
+
+    def events(self):
+        return _FakeEvents(self)
+
+    def calendarList(self):
+        service = self
+
+        class _CalendarList:
+            def list(self, **params):
+                items = [{"id": calendar_id, "selected": True, "primary": calendar_id == "primary"}
+                         for calendar_id in service.calendars]
+                return FakeRequest(service, "calendarList.list", lambda headers: service._page(items, params))
+        return _CalendarList()
+
+
+class _FakeEvents:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, calendarId, syncToken=None, **params):
+        service = self.service
+        service.params.append(dict(params, calendarId=calendarId, syncToken=syncToken))
+
+        def run(headers):
+            if syncToken is not None and service.expired:
+                raise http_error(410)
+            changed = []
+            for calendar_id, event_id in service._log[int(syncToken or 0):]:
+                if calendar_id == calendarId and event_id not in changed:
+                    changed.append(event_id)
+            items = [dict(service.calendars[calendarId][event_id]) for event_id in changed]
+            if syncToken is None:
+                items = [event for event in items if event["status"] != "cancelled"]
+            response = service._page(items, params)
+            if "nextPageToken" not in response:
+                response["nextSyncToken"] = str(len(service._log))
+            return response
+        return FakeRequest(service, "events.list", run)
+
+    def insert(self, calendarId, body, **params):
+        def run(headers):
+            event = dict(body, id=f"E{next(self.service._ids)}", status="confirmed")
+            self.service._touch(calendarId, event)
+            return dict(event)
+        return FakeRequest(self.service, "events.insert", run)
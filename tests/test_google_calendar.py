@@ -0,0 +1,232 @@
+import os
+import pickle
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import google_calendar as gc  # noqa: E402
+from fakes import FakeCalendarService  # noqa: E402
+
+# Sunday afternoon
+NOW = datetime(2026, 10, 18, 15, 30)
+MONDAY = datetime(2026, 10, 19)
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW if tz is None else NOW.astimezone(tz)
+
+
+@pytest.fixture
+def calendar_api(tmp_path, monkeypatch):
+    """A fake Calendar service behind fresh, empty event stores in tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("google_credentials")
+    service = FakeCalendarService()
+    store = gc._EventStore(str(tmp_path / "calendar_cache.pickle"))
+    monkeypatch.setattr(gc, "get_calendar_service", lambda: service)
+    monkeypatch.setattr(gc, "_event_store", store)
+    monkeypatch.setattr(gc, "_stores", {"primary": store})
+    monkeypatch.setattr(gc, "_calendar_ids", None)
+    monkeypatch.setattr(gc, "_calendar_ids_at", 0.0)
+    return service
+
+
+def summaries(records):
+    return [record.summary for record in records]
+
+
+# -----------------------------
+# syncToken store
+# -----------------------------
+def test_delta_sync_applies_changes_and_410_falls_back_to_full_sync(calendar_api):
+    standup = calendar_api.add("Standup", MONDAY.replace(hour=9))
+    review = calendar_api.add("Review", MONDAY.replace(hour=11))
+    store = gc._event_store
+    assert store.sync(calendar_api) == 2
+
+    calendar_api.cancel(standup["id"])
+    calendar_api.add("Lunch", MONDAY.replace(hour=12))
+    assert store.sync(calendar_api) == 2
+    assert calendar_api.params[-1]["syncToken"] == "2"
+    assert summaries(store.events()) == ["Review", "Lunch"]
+
+    # token expired while more changed: the store is rebuilt from a full listing
+    calendar_api.expired = True
+    calendar_api.cancel(review["id"])
+    calendar_api.add("Retro", MONDAY.replace(hour=16))
+    store.sync(calendar_api)
+    assert [params["syncToken"] for params in calendar_api.params[-2:]] == ["4", None]
+    assert summaries(store.events()) == ["Lunch", "Retro"]
+    assert store.find_by_summary("review") == []
+
+    # the new token is kept, also across a reload from disk
+    calendar_api.expired = False
+    reloaded = gc._EventStore(store.path)
+    reloaded.sync(calendar_api)
+    assert calendar_api.params[-1]["syncToken"] == "6"
+    assert summaries(reloaded.events()) == ["Lunch", "Retro"]
+
+
+def test_summary_and_id_lookups_need_no_api_call(calendar_api):
+    # the summary index answers "next upcoming", measured from the real clock
+    soon = datetime.now().replace(microsecond=0) + timedelta(days=2)
+    calendar_api.add("Dentist", soon - timedelta(days=30))
+    calendar_api.add("Dentist", soon)
+    later = calendar_api.add("Dentist", soon + timedelta(days=7))
+    gc.sync_events(force=True)
+    calendar_api.calls.clear()
+
+    store, event = gc._resolve_event("  DENTIST ")
+    assert store is gc._event_store and event.start == soon.timestamp()
+    assert gc._resolve_event(event_id=later["id"])[1].start == (soon + timedelta(days=7)).timestamp()
+    assert not calendar_api.calls
+
+
+# -----------------------------
+# Interval index
+# -----------------------------
+def brute_force(records, t0, t1):
+    return sorted(r.id for r in records if r.start < t1 and r.end > t0)
+
+
+def test_overlap_queries_match_brute_force_with_long_events():
+    rng = random.Random(7)
+    base = MONDAY.timestamp()
+    store = gc._EventStore(os.devnull)
+    store._loaded = True
+    records = []
+    for n in range(400):
+        start = base + rng.randrange(0, 30 * 86400, 900)
+        length = rng.choice([900, 3600, 86400, 3 * 86400, 14 * 86400]) if n % 20 == 0 else rng.choice([900, 1800, 3600])
+        records.append(gc.EventRecord(f"e{n}", f"event {n}", start, start + length))
+    for record in records:
+        store._put_record(record)
+
+    for _ in range(300):
+        t0 = base + rng.randrange(-86400, 31 * 86400, 300)
+        t1 = t0 + rng.choice([300, 3600, 86400, 7 * 86400])
+        found = store.spans(t0, t1)
+        assert sorted(record.id for _, _, record in found) == brute_force(records, t0, t1)
+        assert [start for start, _, _ in found] == sorted(start for start, _, _ in found)
+
+    # a vacation that starts before the window still overlaps it, and is gone once removed
+    vacation = gc.EventRecord("vacation", "Vacation", base - 10 * 86400, base + 10 * 86400)
+    store._put_record(vacation)
+    assert "vacation" in [record.id for record in store.events(base + 86400, base + 86400 + 3600)]
+    store._drop("vacation")
+    assert "vacation" not in [record.id for record in store.events(base + 86400, base + 86400 + 3600)]
+
+    for record in records[::2]:
+        store._drop(record.id)
+    kept = records[1::2]
+    for _ in range(100):
+        t0 = base + rng.randrange(0, 30 * 86400, 300)
+        assert sorted(record.id for record in store.events(t0, t0 + 86400)) == brute_force(kept, t0, t0 + 86400)
+
+
+# -----------------------------
+# Free-slot finder
+# -----------------------------
+def slots(found):
+    return [(slot["start"][-5:], slot["end"][-5:]) for slot in found]
+
+
+def test_free_slots_fit_around_busy_blocks_on_the_grid(calendar_api, monkeypatch):
+    monkeypatch.setattr(gc, "datetime", FrozenDatetime)
+    calendar_api.add("Standup", MONDAY.replace(hour=9))
+    calendar_api.add("Review", MONDAY.replace(hour=10, minute=30), hours=40 / 60)
+    calendar_api.add("Focus time", MONDAY.replace(hour=11, minute=30), hours=1.5, transparency="transparent")
+    calendar_api.add("Holiday", MONDAY, all_day=True)
+    gc.sync_events(force=True)
+
+    found = gc.find_free_slots("30 minutes tomorrow", k=3, use_api=False)
+    assert slots(found) == [("10:00", "10:30"), ("11:15", "11:45"), ("11:45", "12:15")]
+    assert found[0]["start"] == "2026-10-19 10:00"
+
+    # a 20-minute slot takes a 30-minute step; 10:00 is the only start before the review
+    found = gc.find_free_slots("tomorrow", duration_minutes=20, k=3, use_api=False)
+    assert slots(found) == [("10:00", "10:20"), ("11:15", "11:35"), ("11:45", "12:05")]
+
+    found = gc.find_free_slots("an hour tomorrow afternoon", k=2, use_api=False)
+    assert slots(found) == [("14:00", "15:00"), ("15:00", "16:00")]
+
+
+def test_free_slots_today_start_on_the_next_grid_point(calendar_api, monkeypatch):
+    monkeypatch.setattr(gc, "datetime", FrozenDatetime)
+    calendar_api.add("Call", NOW.replace(hour=16, minute=0))
+    gc.sync_events(force=True)
+
+    found = gc.find_free_slots("45 minutes today", k=3, use_api=False)
+    assert slots(found) == [("17:00", "17:45")]
+
+
+# -----------------------------
+# Several calendars
+# -----------------------------
+def test_selected_calendars_merge_in_start_order_without_duplicates(calendar_api):
+    calendar_api.add("Planning", MONDAY.replace(hour=10), iCalUID="plan@example.com")
+    calendar_api.add("Gym", MONDAY.replace(hour=7))
+    calendar_api.add("Planning", MONDAY.replace(hour=10), calendar_id="team@example.com",
+                     iCalUID="plan@example.com")
+    calendar_api.add("Team lunch", MONDAY.replace(hour=10), calendar_id="team@example.com")
+    calendar_api.add("Offsite", MONDAY.replace(hour=8), calendar_id="team@example.com")
+
+    events = list(gc.iter_events(MONDAY, MONDAY + timedelta(days=1)))
+    assert summaries(events) == ["Gym", "Offsite", "Planning", "Team lunch"]
+    assert calendar_api.calls["calendarList.list"] == 1
+    assert {params["calendarId"] for params in calendar_api.params} == {"primary", "team@example.com"}
+    assert summaries(gc.find_conflicts(MONDAY.replace(hour=10), MONDAY.replace(hour=10, minute=30))) == [
+        "Planning", "Team lunch"]
+
+
+# -----------------------------
+# EventRecord
+# -----------------------------
+def test_event_record_from_api_payloads():
+    timed = gc.EventRecord.from_api({
+        "id": "a", "summary": "Sync", "start": {"dateTime": "2026-10-19T09:00:00Z"},
+        "end": {"dateTime": "2026-10-19T09:30:00Z"}, "location": "Room 4",
+        "attendees": [{"email": "Sam@Example.com"}], "transparency": "transparent", "iCalUID": "a@x",
+    })
+    assert timed.end - timed.start == 1800 and not timed.all_day
+    assert timed.transparent and timed.ical_uid == "a@x"
+    assert "room 4" in timed.search_text and "sam@example.com" in timed.search_text
+
+    all_day = gc.EventRecord.from_api({"id": "b", "start": {"date": "2026-10-19"}, "end": {"date": "2026-10-20"}})
+    assert all_day.all_day and all_day.start == MONDAY.timestamp() and all_day.summary == ""
+    assert all_day.to_dict()["start"] == {"date": "2026-10-19"}
+
+    assert gc.EventRecord.from_api({"id": "c", "start": {}, "end": {}}) is None
+
+
+def test_event_record_pickles_and_old_pickles_get_new_slot_defaults():
+    record = gc.EventRecord("a", "Sync", 1.0, 2.0, meet_link="https://meet", ical_uid="a@x")
+    copy = pickle.loads(pickle.dumps(record))
+    assert [getattr(copy, name) for name in gc.EventRecord.__slots__] == [
+        getattr(record, name) for name in gc.EventRecord.__slots__]
+
+    old = gc.EventRecord.__new__(gc.EventRecord)
+    old.__setstate__((None, {"id": "b", "summary": "Old", "start": 1.0, "end": 2.0}))
+    assert old.transparent is False and old.ical_uid is None and old.search_text == ""
+
+
+# -----------------------------
+# Batched creation
+# -----------------------------
+def test_create_events_batches_inserts_and_isolates_a_failed_batch(calendar_api, monkeypatch):
+    monkeypatch.setattr(gc, "BATCH_SIZE", 2)
+    calendar_api.failing_batches = {2}
+    texts = ["standup tomorrow at 9am", "review tomorrow at 11am", "retro tomorrow at 4pm",
+             "planning tomorrow at 2pm", "demo tomorrow at 5pm"]
+
+    results = gc.create_events(texts)
+    assert calendar_api.calls["batch"] == 3 and calendar_api.calls["events.insert"] == 0
+    assert [result["status"] for result in results] == ["success", "success", "error", "error", "success"]
+    created = {result["event_id"] for result in results if result["status"] == "success"}
+    assert {record.id for record in gc._event_store.events()} == created
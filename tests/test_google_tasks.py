@@ -0,0 +1,161 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import google_tasks as gt  # noqa: E402
+from fakes import FakeTasksService  # noqa: E402
+
+
+class _Creds:
+    valid = True
+    refresh_token = "token"
+
+
+@pytest.fixture
+def tasks_api(tmp_path, monkeypatch):
+    """A fake Tasks service behind a fresh local store, index and list directory."""
+    service = FakeTasksService({
+        "My Tasks": [{"title": "Buy milk"}, {"title": "File taxes", "due": "2030-04-15T09:00:00.000Z"}],
+        "Work": [{"title": "Write report"}, {"title": "Old ticket", "status": "completed"}],
+    })
+    monkeypatch.setattr(gt, "_service", service)
+    monkeypatch.setattr(gt, "_creds", _Creds())
+    monkeypatch.setattr(gt, "build", lambda *args, **kwargs: service)
+    monkeypatch.setattr(gt, "_task_store", gt._TaskStore(str(tmp_path / "tasks_cache.db")))
+    monkeypatch.setattr(gt, "_title_index", gt._TaskTitleIndex())
+    monkeypatch.setattr(gt, "_list_directory", gt._TaskListDirectory())
+    return service
+
+
+def titles(records):
+    return [record["title"] for record in records]
+
+
+def test_first_read_syncs_everything_then_later_syncs_send_updated_min(tasks_api):
+    assert titles(gt.iter_all_tasks()) == ["Buy milk", "File taxes", "Write report", "Old ticket"]
+    assert all("updatedMin" not in params for params in tasks_api.params)
+
+    home, work = tasks_api.list_id("My Tasks"), tasks_api.list_id("Work")
+    milk = next(t for t in tasks_api.lists[home]["tasks"].values() if t["title"] == "Buy milk")
+    tasks_api.edit_task(home, milk["id"], title="Buy oat milk")
+    tasks_api.edit_task(work, next(iter(tasks_api.lists[work]["tasks"])), deleted=True)
+    tasks_api.params.clear()
+
+    gt.sync_tasks(concurrent=False)
+    assert {params["tasklist"] for params in tasks_api.params if params.get("updatedMin")} == {home, work}
+    assert titles(gt._task_store.records()) == ["Buy oat milk", "File taxes", "Old ticket"]
+    assert titles(gt._task_store.records("AND t.status != 'completed'")) == ["Buy oat milk", "File taxes"]
+    assert gt._title_index.get("buy oat milk") == (milk["id"], home)
+    assert gt._title_index.get("write report") is None
+
+
+def test_stale_store_is_served_while_a_background_sync_refreshes_it(tasks_api, monkeypatch):
+    gt.sync_tasks(concurrent=False)
+    monkeypatch.setattr(gt, "REVALIDATE_AFTER", 0)
+    tasks_api.add_task(tasks_api.list_id("Work"), {"title": "Late addition"})
+
+    # hold the sync lock so the background refresh cannot finish before the read
+    with gt._sync_lock:
+        assert "Late addition" not in titles(gt.get_all_tasks())
+    gt._get_revalidate_pool().submit(lambda: None).result()
+
+    assert "Late addition" in titles(gt._task_store.records())
+    assert not gt._revalidating.is_set()
+
+
+def test_iter_all_tasks_streams_in_chunks(tasks_api, monkeypatch):
+    monkeypatch.setattr(gt, "RECORD_CHUNK", 1)
+    gt.sync_tasks(concurrent=False)
+    stream = gt.iter_all_tasks(show_completed=False)
+    assert next(stream)["title"] == "Buy milk"
+    # a write while the stream is open neither blocks nor joins it
+    gt.create_task("call the bank")
+    assert titles(stream) == ["File taxes", "Write report"]
+    assert "Call The Bank" in titles(gt._task_store.records())
+
+
+def test_title_lookup_uses_the_index_without_listing(tasks_api):
+    gt.sync_tasks(concurrent=False)
+    tasks_api.calls.clear()
+
+    task, list_id = gt._find_task_by_title_exact("WRITE REPORT")
+    assert task["title"] == "Write report" and list_id == tasks_api.list_id("Work")
+    assert tasks_api.calls == {"tasks.get": 1}
+
+
+def test_patch_sends_cached_etag_and_retries_once_after_412(tasks_api):
+    gt.sync_tasks(concurrent=False)
+    home = tasks_api.list_id("My Tasks")
+    milk_id = gt._title_index.get("buy milk")[0]
+    tasks_api.calls.clear()
+
+    # uncontended: one conditional PATCH, no read
+    gt.update_task("Buy milk", new_due_raw=("2030-05-01", "10:00"))
+    assert tasks_api.calls == {"tasks.patch": 1}
+
+    # someone else edits the task: the cached etag is now stale
+    tasks_api.edit_task(home, milk_id, notes="from phone")
+    tasks_api.calls.clear()
+    updated = gt.complete_task("Buy milk")
+
+    assert tasks_api.calls == {"tasks.patch": 2, "tasks.get": 1}
+    assert updated["status"] == "completed" and updated["notes"] == "from phone"
+    assert gt._task_store.etag(milk_id) == tasks_api.lists[home]["tasks"][milk_id]["etag"]
+
+
+def test_412_on_a_task_renamed_elsewhere_does_not_patch_it(tasks_api):
+    gt.sync_tasks(concurrent=False)
+    home = tasks_api.list_id("My Tasks")
+    milk_id = gt._title_index.get("buy milk")[0]
+    tasks_api.edit_task(home, milk_id, title="Buy bread")
+
+    with pytest.raises(ValueError):
+        gt.complete_task("Buy milk")
+    assert tasks_api.lists[home]["tasks"][milk_id]["status"] == "needsAction"
+
+
+def test_batched_writes_chunk_and_isolate_a_failed_batch(tasks_api, monkeypatch):
+    gt.sync_tasks(concurrent=False)
+    monkeypatch.setattr(gt, "BATCH_SIZE", 2)
+    tasks_api.failing_batches = {2}
+
+    chores = ["pay rent", "water plants", "call the bank", "book dentist", "renew passport"]
+    results = gt.create_tasks(chores)
+    assert tasks_api.calls["batch"] == 3 and tasks_api.calls["tasks.insert"] == 0
+    assert [r["status"] for r in results] == ["success", "success", "error", "error", "success"]
+    assert gt._title_index.get("renew passport") and not gt._title_index.get("call the bank")
+
+    tasks_api.failing_batches = set()
+    results = gt.complete_tasks(["Pay Rent", "Water Plants", "Call The Bank"])
+    assert [r["status"] for r in results] == ["completed", "completed", "error"]
+    assert titles(gt._task_store.records("AND t.status = 'completed'")) == [
+        "Pay Rent", "Water Plants", "Old ticket"]
+
+
+def test_failed_batched_delete_keeps_the_task_findable(tasks_api):
+    gt.sync_tasks(concurrent=False)
+    tasks_api.failing_batches = {1}
+
+    results = gt.delete_tasks(["Buy milk", "Write report"])
+    assert [r["status"] for r in results] == ["error", "error"]
+    assert gt._title_index.get("buy milk") and gt._title_index.get("write report")
+    assert len(gt._task_store.records()) == 4
+
+    tasks_api.failing_batches = set()
+    results = gt.delete_tasks(["Buy milk", "Write report"])
+    assert [r["status"] for r in results] == ["deleted", "deleted"]
+    assert gt._title_index.get("buy milk") is None
+    assert titles(gt._task_store.records()) == ["File taxes", "Old ticket"]
+
+
+def test_delete_of_a_task_already_gone_reports_that_task_only(tasks_api):
+    gt.sync_tasks(concurrent=False)
+    home = tasks_api.list_id("My Tasks")
+    tasks_api.edit_task(home, gt._title_index.get("buy milk")[0], deleted=True)
+
+    results = gt.delete_tasks(["Buy milk", "File taxes"])
+    assert [r["status"] for r in results] == ["error", "deleted"]
+    assert "404" in results[0]["message"]
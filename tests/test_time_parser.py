@@ -0,0 +1,89 @@
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time_parser  # noqa: E402
+
+# Sunday afternoon
+NOW = datetime(2026, 10, 18, 15, 30)
+
+
+def parse(text, policy=time_parser.DEFAULT_POLICY):
+    return time_parser.parse(text, NOW, policy).strftime("%Y-%m-%d %H:%M")
+
+
+def test_meal_word_in_title_does_not_override_time_of_day():
+    assert parse("create event dinner with parents on 5 jan at noon") == "2027-01-05 12:00"
+    assert parse("breakfast meeting friday at noon") == "2026-10-23 12:00"
+    assert parse("team lunch review tomorrow morning") == "2026-10-19 09:00"
+
+
+def test_meal_word_alone_still_sets_time():
+    assert parse("lunch with sam tomorrow") == "2026-10-19 12:30"
+    assert parse("dinner friday") == "2026-10-23 19:00"
+
+
+def test_coming_weekday_is_the_bare_weekday():
+    assert parse("coming monday") == "2026-10-19 14:00"
+    assert parse("coming sunday") == "2026-10-25 14:00"
+    assert parse("next monday") == "2026-10-26 14:00"
+
+
+def test_month_only_phrases_reach_the_fallback():
+    for text in ("in march", "early december", "sometime in sept"):
+        assert time_parser.DATE_HINT_RE.search(text)
+    assert not time_parser.DATE_HINT_RE.search("buy milk")
+
+
+def test_fallback_hands_month_only_phrase_to_dateparser(monkeypatch):
+    seen = []
+
+    class FakeDateparser:
+        @staticmethod
+        def parse(text, settings=None):
+            seen.append(text)
+            return datetime(2027, 3, 1)
+
+    monkeypatch.setattr(time_parser, "_load_dateparser", lambda: FakeDateparser)
+    assert time_parser.fallback_parse("In March") == datetime(2027, 3, 1)
+    assert time_parser.fallback_parse("buy milk") is None
+    assert seen == ["in march"]
+
+
+def test_parse_cache_hits_within_a_day_and_drops_entries_on_rollover():
+    time_parser.clear_parse_cache()
+    assert parse("lunch with sam tomorrow") == "2026-10-19 12:30"
+    assert parse("Lunch  with Sam tomorrow") == "2026-10-19 12:30"
+    stats = time_parser.parse_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["day"]) == (1, 1, "2026-10-18")
+
+    # an anchor from yesterday must not be served: "tomorrow" moves on
+    monday = datetime(2026, 10, 19, 8, 0)
+    assert time_parser.parse("lunch with sam tomorrow", monday).strftime("%Y-%m-%d %H:%M") == "2026-10-20 12:30"
+    stats = time_parser.parse_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"], stats["day"]) == (1, 2, 1, "2026-10-19")
+
+
+def test_parse_many_flags_grammar_fallback_and_default(monkeypatch):
+    class FakeDateparser:
+        @staticmethod
+        def parse(text, settings=None):
+            return datetime(2027, 3, 1) if "march" in text else None
+
+    monkeypatch.setattr(time_parser, "_load_dateparser", lambda: FakeDateparser)
+    texts = ["dinner friday", "buy milk", "in march", "Dinner  Friday"]
+
+    stamps, flags = time_parser.parse_many(texts, NOW)
+    assert list(flags) == [time_parser.CONFIDENCE_GRAMMAR, time_parser.CONFIDENCE_DEFAULT,
+                           time_parser.CONFIDENCE_DEFAULT, time_parser.CONFIDENCE_GRAMMAR]
+    assert stamps[0] == stamps[3] == datetime(2026, 10, 23, 19, 0).timestamp()
+    assert stamps[1] == time_parser.parse("buy milk", NOW).timestamp()
+
+    stamps, flags = time_parser.parse_many(texts, NOW, fallback=True)
+    assert list(flags) == [time_parser.CONFIDENCE_GRAMMAR, time_parser.CONFIDENCE_DEFAULT,
+                           time_parser.CONFIDENCE_FALLBACK, time_parser.CONFIDENCE_GRAMMAR]
+    # a date-only fallback result takes the policy's default time
+    default_hour, default_minute = time_parser.DEFAULT_POLICY.default_time
+    assert stamps[2] == datetime(2027, 3, 1, default_hour, default_minute).timestamp()
@@ -0,0 +1,526 @@
+import re
+import threading
+from array import array
+from collections import Counter, OrderedDict, namedtuple
+from datetime import datetime, time, timedelta
+
+
+# -----------------------------
+# Vocabulary
+# -----------------------------
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+WEEKDAYS = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
+
+RELATIVE_DAYS = {
+    'today': 0, 'tomorrow': 1, 'day after tomorrow': 2, 'yesterday': -1,
+    'next week': 7, 'next month': 30
+}
+
+# Clock time each vague part of the day stands for when no explicit time is given
+VAGUE_TIMES = {
+    'noon': (12, 0), 'midday': (12, 0), 'midnight': (0, 0),
+    'breakfast': (8, 0), 'morning': (9, 0), 'lunch': (12, 30),
+    'afternoon': (14, 0), 'evening': (18, 0), 'dinner': (19, 0),
+    'night': (20, 0), 'tonight': (20, 0)
+}
+
+# When a phrase holds several vague words the earliest in this list wins, so
+# a meal in a title ("dinner with parents ... at noon") cannot override the
+# time of day the user asked for.
+VAGUE_PRIORITY = {
+    word: rank for rank, word in enumerate([
+        'noon', 'midday', 'midnight', 'morning', 'afternoon', 'evening',
+        'night', 'tonight', 'lunch', 'dinner', 'breakfast'
+    ])
+}
+
+DEFAULT_TIME = (14, 0)
+
+_MONTH = (r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?'
+          r'|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)')
+_WEEKDAY = (r'(?:mon(?:day)?|tue(?:s(?:day)?)?|wed(?:nesday)?|thu(?:r(?:s(?:day)?)?)?'
+            r'|fri(?:day)?|sat(?:urday)?|sun(?:day)?)')
+_ORDINAL = r'(?:st|nd|rd|th)?'
+
+# One alternation over everything the parsers understand, so a command is
+# scanned once. Alternatives sharing a start position are tried in order, which
+# is what makes "12 dec" a date rather than a bare number and "next monday" a
+# weekday rather than "next week".
+TOKEN_RE = re.compile(rf'''
+    \b(?:
+        (?P<rel>day\ after\ tomorrow|today|tomorrow|yesterday|next\ (?:week|month))
+      | (?P<wd>(?:(?P<wd_pre>this|next|coming)\s+)?(?P<wd_name>{_WEEKDAY}))
+      | (?P<md>(?P<md_mon>{_MONTH})\.?\s+(?P<md_day>\d{{1,2}}){_ORDINAL}(?:,?\s*(?P<md_year>\d{{4}}))?)
+      | (?P<dm>(?P<dm_day>\d{{1,2}}){_ORDINAL}\s+(?:of\s+)?(?P<dm_mon>{_MONTH})(?:,?\s*(?P<dm_year>\d{{4}}))?)
+      | (?P<iso>(?P<iso_y>\d{{4}})[-/](?P<iso_m>\d{{1,2}})[-/](?P<iso_d>\d{{1,2}}))
+      | (?P<num>(?P<num_a>\d{{1,2}})[/-](?P<num_b>\d{{1,2}})(?:[/-](?P<num_y>\d{{4}}|\d{{2}}))?(?!\s*[ap]m))
+      | (?P<at>at\s+(?P<at_h>\d{{1,2}})(?!\s*(?:[:\d]|[ap]m\b)))
+      | (?P<clock>(?P<clk_h>\d{{1,2}})(?::(?P<clk_m>\d{{2}})\s*(?P<clk_p>[ap]m)?|\s*(?P<clk_p2>[ap]m)))
+      | (?P<delta>in\s+(?P<delta_n>\d+|an?)\s+(?P<delta_unit>min(?:ute)?s?|h(?:ou)?rs?|days?|weeks?))
+      | (?P<vague>{'|'.join(VAGUE_TIMES)})
+    )\b
+''', re.VERBOSE)
+
+# Clock tokens rank by how explicit they are: "6:30 pm" / "6pm" beat "18:30",
+# which beats a bare "at 6".
+_RANK_PERIOD, _RANK_24H, _RANK_BARE = 0, 1, 2
+
+
+class Tokens:
+    """
+    What one pass over a phrase found. The first token of each kind wins,
+    except clock times (most explicit wins) and vague words (VAGUE_PRIORITY).
+    """
+    __slots__ = ('date', 'weekday', 'relative', 'clock', 'vague', 'delta')
+
+    def __init__(self):
+        self.date = None        # (year or None, month, day)
+        self.weekday = None     # (weekday, 'this' | 'next' | 'coming' | None)
+        self.relative = None    # offset in days from today
+        self.clock = None       # (rank, hour, minute)
+        self.vague = None       # key of VAGUE_TIMES, by VAGUE_PRIORITY
+        self.delta = None       # timedelta from now ("in 2 hours")
+
+    def __bool__(self):
+        return any(getattr(self, name) is not None for name in self.__slots__)
+
+    def __repr__(self):
+        found = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__
+                          if getattr(self, name) is not None)
+        return f'Tokens({found})'
+
+
+def _to_24h(hour, period):
+    if period == 'pm' and hour < 12:
+        return hour + 12
+    if period == 'am' and hour == 12:
+        return 0
+    return hour
+
+
+def _date_token(m, kind):
+    if kind == 'md':
+        year, month, day = m.group('md_year'), MONTHS[m.group('md_mon')[:3]], int(m.group('md_day'))
+    elif kind == 'dm':
+        year, month, day = m.group('dm_year'), MONTHS[m.group('dm_mon')[:3]], int(m.group('dm_day'))
+    elif kind == 'iso':
+        year, month, day = m.group('iso_y'), int(m.group('iso_m')), int(m.group('iso_d'))
+    else:
+        # D/M when the first number cannot be a month, M/D otherwise
+        a, b = int(m.group('num_a')), int(m.group('num_b'))
+        month, day = (b, a) if a > 12 else (a, b)
+        year = m.group('num_y')
+        if year and len(year) == 2:
+            year = int(year)
+            year += 2000 if year < 50 else 1900
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return None
+    return (int(year) if year else None, month, day)
+
+
+def _clock_token(m, kind):
+    if kind == 'at':
+        hour, minute, rank = int(m.group('at_h')), 0, _RANK_BARE
+        # "at 6" on its own means the afternoon/evening
+        if hour <= 11:
+            hour += 12
+    else:
+        hour = int(m.group('clk_h'))
+        minute = int(m.group('clk_m') or 0)
+        period = m.group('clk_p') or m.group('clk_p2')
+        rank = _RANK_PERIOD if period else _RANK_24H
+        hour = _to_24h(hour, period)
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        return None
+    return (rank, hour, minute)
+
+
+def tokenize(text):
+    """Scan text once and collect its date, time and vagueness tokens."""
+    tokens = Tokens()
+    for m in TOKEN_RE.finditer(text.lower()):
+        kind = m.lastgroup
+        if kind == 'rel':
+            if tokens.relative is None:
+                tokens.relative = RELATIVE_DAYS[m.group('rel')]
+        elif kind == 'wd':
+            if tokens.weekday is None:
+                tokens.weekday = (WEEKDAYS[m.group('wd_name')[:3]], m.group('wd_pre'))
+        elif kind in ('md', 'dm', 'iso', 'num'):
+            if tokens.date is None:
+                tokens.date = _date_token(m, kind)
+        elif kind in ('at', 'clock'):
+            clock = _clock_token(m, kind)
+            if clock and (tokens.clock is None or clock[0] < tokens.clock[0]):
+                tokens.clock = clock
+        elif kind == 'delta':
+            n, unit = m.group('delta_n'), m.group('delta_unit')
+            n = int(n) if n.isdigit() else 1
+            if unit.startswith('d') or unit.startswith('w'):
+                if tokens.relative is None:
+                    tokens.relative = n * 7 if unit.startswith('w') else n
+            elif tokens.delta is None:
+                tokens.delta = timedelta(minutes=n) if unit.startswith('m') else timedelta(hours=n)
+        else:
+            vague = m.group('vague')
+            if tokens.vague is None or VAGUE_PRIORITY[vague] < VAGUE_PRIORITY[tokens.vague]:
+                tokens.vague = vague
+    return tokens
+
+
+# -----------------------------
+# Resolution
+# -----------------------------
+class ParsePolicy:
+    """
+    How a caller turns tokens into a datetime. Instances are module-level
+    constants and double as part of the parse cache key.
+
+    weekday_today lets a bare weekday mean today; next_skips_week makes
+    "next friday" the one after the coming friday ("coming friday" is
+    always a bare weekday); roll_year moves a year-less date that has
+    already passed into next year.
+    """
+    __slots__ = ('default_time', 'vague_times', 'weekday_today', 'next_skips_week', 'roll_year')
+
+    def __init__(self, default_time=DEFAULT_TIME, vague_times=VAGUE_TIMES,
+                 weekday_today=False, next_skips_week=True, roll_year=True):
+        self.default_time = default_time
+        self.vague_times = vague_times
+        self.weekday_today = weekday_today
+        self.next_skips_week = next_skips_week
+        self.roll_year = roll_year
+
+
+DEFAULT_POLICY = ParsePolicy()
+
+
+def resolve_date(tokens, today, policy=DEFAULT_POLICY):
+    """
+    Calendar date the tokens point at, or None when they name no day.
+    An explicit date wins over a weekday, which wins over a relative word.
+    """
+    if tokens.date is not None:
+        year, month, day = tokens.date
+        try:
+            target = today.replace(year=year or today.year, month=month, day=day)
+            if year is None and policy.roll_year and target < today:
+                target = target.replace(year=target.year + 1)
+            return target
+        except ValueError:
+            pass
+    if tokens.weekday is not None:
+        weekday, prefix = tokens.weekday
+        days_ahead = (weekday - today.weekday()) % 7
+        if days_ahead == 0 and not policy.weekday_today:
+            days_ahead = 7
+        if prefix == 'next' and policy.next_skips_week:
+            days_ahead = (days_ahead or 7) + 7
+        return today + timedelta(days=days_ahead)
+    if tokens.relative is not None:
+        return today + timedelta(days=tokens.relative)
+    return None
+
+
+def resolve_time(tokens, vague_times=VAGUE_TIMES):
+    """(hour, minute) the tokens point at, or None when they name no time."""
+    if tokens.clock is not None:
+        return tokens.clock[1:]
+    if tokens.vague is not None:
+        return vague_times.get(tokens.vague)
+    return None
+
+
+# The part of a parse that only depends on which day it is. `dated` is set
+# when the phrase names a day, `explicit` when it names a calendar date, and
+# `delta` replaces `when` for a bare "in N hours/minutes".
+Anchor = namedtuple('Anchor', 'when dated explicit delta')
+
+
+def _anchor(tokens, today, policy):
+    if not tokens:
+        return None
+    if tokens.delta is not None and tokens.clock is None and tokens.date is None \
+            and tokens.weekday is None and tokens.relative is None:
+        return Anchor(None, False, False, tokens.delta)
+    day = resolve_date(tokens, today, policy)
+    hour, minute = resolve_time(tokens, policy.vague_times) or policy.default_time
+    return Anchor(datetime.combine(day or today, time(hour, minute)),
+                  day is not None, tokens.date is not None, None)
+
+
+def _finish(anchor, now, policy):
+    """
+    Apply the clock to an anchor: "in N hours" counts from now, and a time
+    with no day that has already passed today means tomorrow.
+    """
+    if anchor is None:
+        anchor = Anchor(datetime.combine(now.date(), time(*policy.default_time)), False, False, None)
+    if anchor.delta is not None:
+        return now.replace(second=0, microsecond=0) + anchor.delta
+    when = anchor.when
+    if not anchor.dated and when < now:
+        when += timedelta(days=1)
+    return when
+
+
+def resolve(tokens, now, policy=DEFAULT_POLICY):
+    """Combine tokens into a datetime relative to now."""
+    return _finish(_anchor(tokens, now.date(), policy), now, policy)
+
+
+# -----------------------------
+# Day-anchored parse cache
+# -----------------------------
+PARSE_CACHE_SIZE = 2048
+
+_MISSING = object()
+
+
+class ParseCache:
+    """
+    Bounded LRU of anchors keyed by normalized phrase and policy.
+
+    Anchors are only valid for the day they were computed on, so the whole
+    cache is dropped the first time it is used on a new local date. Hits
+    and misses are counted across days.
+    """
+
+    def __init__(self, maxsize=PARSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._day = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, text, today, policy=DEFAULT_POLICY):
+        """Anchor for text on today, or None when the grammar finds nothing in it."""
+        key = (' '.join(text.lower().split()), policy)
+        with self._lock:
+            if today != self._day:
+                self._entries.clear()
+                self._day = today
+            anchor = self._entries.get(key, _MISSING)
+            if anchor is not _MISSING:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return anchor
+            self.misses += 1
+
+        anchor = _anchor(tokenize(key[0]), today, policy)
+        with self._lock:
+            if self._day == today:
+                self._entries[key] = anchor
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return anchor
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'day': self._day.isoformat() if self._day else None,
+            }
+
+
+_cache = ParseCache()
+
+
+def parse_cache_stats():
+    """Hit/miss counters of the shared parse cache."""
+    return _cache.stats()
+
+
+def clear_parse_cache():
+    _cache.clear()
+
+
+# -----------------------------
+# Grammar misses and the dateparser fallback
+# -----------------------------
+MISSED_PHRASES_KEPT = 100
+
+# Anything dateparser could plausibly turn into a date. Phrases without any
+# of these ("buy milk") skip the fallback instead of paying for a parse that
+# returns None.
+DATE_HINT_RE = re.compile(rf'\d|{_MONTH}|week|month|year|hour|min|day|night|noon|ago|fortnight|now')
+
+
+class GrammarStats:
+    """
+    How often match() found nothing and callers had to fall back. The most
+    frequent missed phrases are kept, up to MISSED_PHRASES_KEPT distinct
+    ones, to show what the grammar should learn next.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+        self.missed = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, text, hit, count=1):
+        with self._lock:
+            if hit:
+                self.hits += count
+                return
+            self.misses += count
+            phrase = ' '.join(text.lower().split())
+            if phrase in self.missed or len(self.missed) < MISSED_PHRASES_KEPT:
+                self.missed[phrase] += count
+
+    def record_fallback(self):
+        with self._lock:
+            self.fallbacks += 1
+
+    def stats(self, top=10):
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'miss_rate': self.misses / calls if calls else 0.0,
+                'dateparser_calls': self.fallbacks,
+                'top_misses': self.missed.most_common(top),
+            }
+
+
+_grammar = GrammarStats()
+_dateparser = None
+
+
+def grammar_stats(top=10):
+    """Miss rate of the grammar and its most frequent missed phrases."""
+    return _grammar.stats(top)
+
+
+def _load_dateparser():
+    global _dateparser
+    if _dateparser is None:
+        try:
+            import dateparser
+        except ImportError:
+            dateparser = False
+        _dateparser = dateparser
+    return _dateparser or None
+
+
+def fallback_parse(text, settings=None):
+    """
+    Hand a phrase the grammar missed to dateparser, importing it on first
+    use. Returns None without touching dateparser when the phrase has
+    nothing date-like in it or dateparser is not installed.
+    """
+    text = text.lower().strip()
+    if not DATE_HINT_RE.search(text):
+        return None
+    dateparser = _load_dateparser()
+    if dateparser is None:
+        return None
+    _grammar.record_fallback()
+    return dateparser.parse(text, settings=settings)
+
+
+def match(text, now=None, policy=DEFAULT_POLICY):
+    """Parse text into a datetime, or None when the grammar finds nothing in it."""
+    now = now or datetime.now()
+    anchor = _cache.lookup(text, now.date(), policy)
+    _grammar.record(text, anchor is not None)
+    return None if anchor is None else _finish(anchor, now, policy)
+
+
+def parse(text, now=None, policy=DEFAULT_POLICY):
+    """Parse text into a datetime, falling back to today at the policy's default time."""
+    now = now or datetime.now()
+    return _finish(_cache.lookup(text, now.date(), policy), now, policy)
+
+
+# -----------------------------
+# Bulk parsing
+# -----------------------------
+# Confidence flags returned by parse_many()
+CONFIDENCE_DEFAULT = 0      # nothing recognised; parse()'s default was used
+CONFIDENCE_FALLBACK = 1     # grammar miss that dateparser understood
+CONFIDENCE_GRAMMAR = 2      # parsed by the grammar
+
+
+def parse_many(texts, now=None, policy=DEFAULT_POLICY, fallback=False):
+    """
+    Parse a sequence of phrases against one reference time.
+
+    Returns (timestamps, confidence): an array('d') of epoch seconds and an
+    array('b') of CONFIDENCE_* flags, both aligned with texts. Identical
+    phrases (after normalization) are parsed once and fanned out. With
+    fallback, grammar misses go to dateparser before taking the default.
+    """
+    now = now or datetime.now()
+    today = now.date()
+    groups = {}
+    for i, text in enumerate(texts):
+        groups.setdefault(' '.join(text.lower().split()), []).append(i)
+
+    count = sum(len(indices) for indices in groups.values())
+    timestamps = array('d', [0.0]) * count
+    confidence = array('b', [CONFIDENCE_DEFAULT]) * count
+    settings = {'PREFER_DATES_FROM': 'future', 'RELATIVE_BASE': now}
+    for phrase, indices in groups.items():
+        anchor = _cache.lookup(phrase, today, policy)
+        _grammar.record(phrase, anchor is not None, len(indices))
+        when, flag = None, CONFIDENCE_GRAMMAR
+        if anchor is None:
+            parsed = fallback_parse(phrase, settings) if fallback else None
+            if parsed:
+                if parsed.hour == 0 and parsed.minute == 0:
+                    parsed = parsed.replace(hour=policy.default_time[0], minute=policy.default_time[1])
+                when, flag = parsed, CONFIDENCE_FALLBACK
+            else:
+                flag = CONFIDENCE_DEFAULT
+        stamp = (when or _finish(anchor, now, policy)).timestamp()
+        for i in indices:
+            timestamps[i] = stamp
+            confidence[i] = flag
+    return timestamps, confidence
+
+
+class SmartTimeParser:
+    """Time parsing utility for natural language"""
+
+    def extract_datetime(self, text):
+        """Extract datetime from natural language"""
+        return parse(text)
+
+    def extract_datetime_for_email(self, text):
+        """Extract datetime for email scheduling; anything in the past without an explicit date moves a day on"""
+        now = datetime.now()
+        anchor = _cache.lookup(text, now.date())
+        when = _finish(anchor, now, DEFAULT_POLICY)
+        if when < now and not (anchor and anchor.explicit):
+            when += timedelta(days=1)
+        return when
+
+    def _extract_date(self, text, now):
+        """Extract date from text"""
+        anchor = _cache.lookup(text, now.date())
+        if anchor is not None and anchor.dated:
+            return anchor.when.date()
+        return now.date()
+
+    def _extract_time(self, text):
+        """Extract time from text"""
+        return resolve_time(tokenize(text)) or DEFAULT_TIME